@@ -4,9 +4,13 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import os
 import sys
-sys.path.append('/home/odunayo12/python-data-analysis-course')
-from Utilities.olist_helper import load_olist_data
+# Make the course Utilities package importable (three folders up from this app)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from Utilities.olist_helper import filter_satisfaction_data, load_satisfaction_data
+from Utilities.visualization_helper import cached_plotly_figure
+from Utilities.streamlit_helper import paginated_dataframe
 
 # App configuration
 st.set_page_config(
@@ -17,39 +21,17 @@ st.set_page_config(
 )
 
 # 1. DATA LOADING (Converted from notebook)
-@st.cache_data
+# The merge, date parsing and cleaning from the notebook now live in
+# prepare_satisfaction_data and run once, offline:
+#     python -c "from Utilities.olist_helper import build_satisfaction_data; build_satisfaction_data()"
+# The app memory-maps the result. cache_resource keeps one shared frame per
+# process instead of a copy per rerun, so the frame must not be modified.
+@st.cache_resource
 def load_and_prepare_data():
-    """Load and prepare data for analysis - converted from notebook cells"""
+    """Load the prepared satisfaction dataset (built on first use if missing)"""
     
-    with st.spinner("Loading Olist data..."):
-        # Load core datasets
-        orders = load_olist_data('olist_orders_dataset')
-        reviews = load_olist_data('olist_order_reviews_dataset')
-        customers = load_olist_data('olist_customers_dataset')
-        
-        # Merge datasets (cleaned up from notebook)
-        merged_data = orders.merge(reviews, on='order_id', how='inner')
-        merged_data = merged_data.merge(customers, on='customer_id', how='left')
-        
-        # Data preparation (extracted from notebook)
-        merged_data['order_purchase_timestamp'] = pd.to_datetime(merged_data['order_purchase_timestamp'])
-        merged_data['order_delivered_customer_date'] = pd.to_datetime(merged_data['order_delivered_customer_date'])
-        merged_data['order_estimated_delivery_date'] = pd.to_datetime(merged_data['order_estimated_delivery_date'])
-        
-        # Business logic (from notebook)
-        merged_data['actual_delivery_days'] = (merged_data['order_delivered_customer_date'] - 
-                                              merged_data['order_purchase_timestamp']).dt.days
-        merged_data['estimated_delivery_days'] = (merged_data['order_estimated_delivery_date'] - 
-                                                 merged_data['order_purchase_timestamp']).dt.days
-        merged_data['delivery_delay'] = merged_data['actual_delivery_days'] - merged_data['estimated_delivery_days']
-        merged_data['is_late'] = merged_data['delivery_delay'] > 0
-        
-        # Clean data (improved from notebook)
-        clean_data = merged_data.dropna(subset=['review_score', 'actual_delivery_days'])
-        clean_data = clean_data[clean_data['actual_delivery_days'] >= 0]  # Remove invalid dates
-        clean_data = clean_data[clean_data['actual_delivery_days'] <= 100]  # Remove outliers
-        
-    return clean_data
+    with st.spinner("Loading prepared satisfaction data..."):
+        return load_satisfaction_data()
 
 # 2. USER CONTROLS (New - not in notebook)
 def create_user_controls(data):
@@ -94,27 +76,13 @@ def create_user_controls(data):
 def perform_analysis(data, filters):
     """Perform analysis with user filters applied"""
     
-    # Apply filters
-    filtered_data = data.copy()
-    
-    # Date filter
-    if len(filters['date_range']) == 2:
-        start_date, end_date = filters['date_range']
-        filtered_data = filtered_data[
-            (filtered_data['order_purchase_timestamp'].dt.date >= start_date) &
-            (filtered_data['order_purchase_timestamp'].dt.date <= end_date)
-        ]
-    
-    # State filter
-    if filters['states']:
-        filtered_data = filtered_data[filtered_data['customer_state'].isin(filters['states'])]
-    
-    # Score filter
-    min_score, max_score = filters['score_range']
-    filtered_data = filtered_data[
-        (filtered_data['review_score'] >= min_score) &
-        (filtered_data['review_score'] <= max_score)
-    ]
+    # Apply filters (one combined mask, no copy of the full dataset)
+    filtered_data = filter_satisfaction_data(
+        data,
+        date_range=filters['date_range'],
+        states=filters['states'],
+        score_range=filters['score_range']
+    )
     
     # Calculate key metrics (from notebook)
     total_orders = len(filtered_data)
@@ -139,7 +107,14 @@ def perform_analysis(data, filters):
             'avg_delivery_time': avg_delivery_time,
             'correlation': delivery_satisfaction_corr
         },
-        'satisfaction_by_performance': satisfaction_by_performance
+        'satisfaction_by_performance': satisfaction_by_performance,
+        # The filter settings identify the filtered data, so charts of it are
+        # cached on them instead of hashing the rows on every rerun
+        'cache_key': (
+            tuple(filters['date_range']),
+            tuple(filters['states']),
+            tuple(filters['score_range'])
+        )
     }
 
 # 4. PRESENTATION (Converted from notebook visualizations)
@@ -170,11 +145,13 @@ def display_results(results):
     
     with col1:
         # Review score distribution (converted from histogram)
-        fig_hist = px.histogram(
+        fig_hist = cached_plotly_figure(
+            px.histogram,
             data, 
             x='review_score', 
             title='Review Score Distribution',
-            nbins=5
+            nbins=5,
+            cache_key=results['cache_key']
         )
         st.plotly_chart(fig_hist, use_container_width=True)
     
@@ -183,7 +160,8 @@ def display_results(results):
         perf_data = results['satisfaction_by_performance'].reset_index()
         perf_data['delivery_status'] = perf_data['is_late'].map({False: 'On Time', True: 'Late'})
         
-        fig_bar = px.bar(
+        fig_bar = cached_plotly_figure(
+            px.bar,
             perf_data,
             x='delivery_status',
             y='mean',
@@ -197,18 +175,21 @@ def display_results(results):
     
     with col1:
         # Delivery time distribution (converted from histogram)
-        fig_delivery = px.histogram(
+        fig_delivery = cached_plotly_figure(
+            px.histogram,
             data,
             x='actual_delivery_days',
             title='Delivery Time Distribution',
-            nbins=30
+            nbins=30,
+            cache_key=results['cache_key']
         )
         st.plotly_chart(fig_delivery, use_container_width=True)
     
     with col2:
         # Correlation scatter (converted from matplotlib scatter)
-        fig_scatter = px.scatter(
-            data.sample(min(5000, len(data))),  # Sample for performance
+        fig_scatter = cached_plotly_figure(
+            px.scatter,
+            data.sample(min(5000, len(data)), random_state=0),  # Sample for performance (fixed seed so the chart is cached)
             x='actual_delivery_days',
             y='review_score',
             title='Delivery Time vs Review Score',
@@ -233,7 +214,7 @@ def display_results(results):
     # Raw data (optional)
     if st.checkbox("Show Raw Data"):
         st.subheader("Filtered Dataset")
-        st.dataframe(data)
+        paginated_dataframe(data, key='raw_data', search_columns=['order_id', 'customer_id'])
 
 # 5. MAIN APPLICATION
 def main():
@@ -10,6 +10,11 @@ import json
 import hashlib
 from typing import Dict, List, Optional, Union
 import logging
+import os
+import sys
+# Make the course Utilities package importable (three folders up from this app)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from Utilities.synthetic_data_helper import format_ids, id_column, table_rng
 
 # Configure page
 st.set_page_config(
@@ -95,25 +100,25 @@ class SupabaseConnectionManager:
         Simulate database query results for demonstration.
         In production, this would be replaced with actual Supabase queries.
         """
-        np.random.seed(42)
+        rng = table_rng(42, 'simulated_query')
         
         if 'orders' in query.lower():
             # Simulate orders data
             n_records = params.get('limit', 1000) if params else 1000
             
-            dates = pd.date_range('2024-01-01', periods=n_records, freq='H')
+            dates = pd.date_range('2024-01-01', periods=n_records, freq='h')
             
             data = {
-                'order_id': [f"ORD_{i:08d}" for i in range(1, n_records + 1)],
-                'customer_id': [f"CUST_{np.random.randint(1, 10000):06d}" for _ in range(n_records)],
+                'order_id': format_ids(np.arange(1, n_records + 1), 'ORD_', 8),
+                'customer_id': id_column(rng.integers(1, 10000, n_records), 'CUST_', 6),
                 'order_date': dates,
-                'total_amount': np.random.exponential(120, n_records),
-                'status': np.random.choice(['completed', 'processing', 'shipped'], n_records, p=[0.7, 0.2, 0.1]),
-                'customer_satisfaction': np.random.choice([1, 2, 3, 4, 5], n_records, p=[0.05, 0.1, 0.2, 0.35, 0.3]),
-                'product_category': np.random.choice([
+                'total_amount': rng.exponential(120, n_records),
+                'status': rng.choice(['completed', 'processing', 'shipped'], n_records, p=[0.7, 0.2, 0.1]),
+                'customer_satisfaction': rng.choice([1, 2, 3, 4, 5], n_records, p=[0.05, 0.1, 0.2, 0.35, 0.3]),
+                'product_category': rng.choice([
                     'Electronics', 'Fashion', 'Home & Garden', 'Books', 'Sports'
                 ], n_records),
-                'seller_state': np.random.choice(['SP', 'RJ', 'MG', 'RS', 'PR'], n_records)
+                'seller_state': rng.choice(['SP', 'RJ', 'MG', 'RS', 'PR'], n_records)
             }
             
             return pd.DataFrame(data)
@@ -123,13 +128,13 @@ class SupabaseConnectionManager:
             n_records = params.get('limit', 500) if params else 500
             
             data = {
-                'customer_id': [f"CUST_{i:06d}" for i in range(1, n_records + 1)],
+                'customer_id': format_ids(np.arange(1, n_records + 1), 'CUST_', 6),
                 'registration_date': pd.date_range('2023-01-01', periods=n_records, freq='D'),
-                'total_orders': np.random.poisson(5, n_records),
-                'lifetime_value': np.random.exponential(500, n_records),
-                'customer_segment': np.random.choice(['Premium', 'Standard', 'Budget'], n_records, p=[0.2, 0.5, 0.3]),
-                'state': np.random.choice(['SP', 'RJ', 'MG', 'RS', 'PR'], n_records),
-                'active': np.random.choice([True, False], n_records, p=[0.8, 0.2])
+                'total_orders': rng.poisson(5, n_records),
+                'lifetime_value': rng.exponential(500, n_records),
+                'customer_segment': rng.choice(['Premium', 'Standard', 'Budget'], n_records, p=[0.2, 0.5, 0.3]),
+                'state': rng.choice(['SP', 'RJ', 'MG', 'RS', 'PR'], n_records),
+                'active': rng.choice([True, False], n_records, p=[0.8, 0.2])
             }
             
             return pd.DataFrame(data)
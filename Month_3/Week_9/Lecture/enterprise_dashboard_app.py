@@ -5,8 +5,15 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime
+from pandas.tseries.frequencies import to_offset
 import time
+import os
+import sys
+# Make the course Utilities package importable (three folders up from this app)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from Utilities.synthetic_data_helper import EnterpriseDataStore
+from Utilities.streamlit_helper import paginated_dataframe
 
 # Configure page with enterprise settings
 st.set_page_config(
@@ -107,72 +114,113 @@ if 'user_role' not in st.session_state:
 if 'selected_page' not in st.session_state:
     st.session_state.selected_page = 'Dashboard Overview'
 
+# Rolling data store (last 180 days), kept for the lifetime of the server process
+@st.cache_resource
+def get_enterprise_store():
+    """
+    Create the enterprise data store (6 months of daily data) once per process.
+    """
+    return EnterpriseDataStore(days=180, seed=42)
+
 # Generate comprehensive business data
 @st.cache_data(ttl=600)  # Cache for 10 minutes
 def generate_enterprise_data():
     """
     Generate comprehensive business data for enterprise dashboard.
+    
+    Only the days since the store's last refresh are generated, and the
+    monthly and department aggregates are updated with just those days.
+    The per-department rows stay in the store: the pages only use their
+    means, and st.cache_data copies every returned frame on each rerun.
     """
-    np.random.seed(42)
-    
-    # Generate 6 months of daily data
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=180)
-    date_range = pd.date_range(start_date, end_date, freq='D')
-    
-    # Simulate business growth and seasonality
-    base_orders = 1000
-    growth_trend = np.arange(len(date_range)) * 2
-    seasonal = np.sin(np.arange(len(date_range)) * 2 * np.pi / 30) * 100  # Monthly cycle
-    weekly = np.sin(np.arange(len(date_range)) * 2 * np.pi / 7) * 50      # Weekly cycle
-    noise = np.random.normal(0, 50, len(date_range))
-    
-    daily_orders = base_orders + growth_trend + seasonal + weekly + noise
-    daily_orders = np.maximum(daily_orders, 100)  # Minimum orders
-    
-    # Generate correlated business metrics
-    revenue_per_order = np.random.normal(85, 15, len(date_range))
-    daily_revenue = daily_orders * revenue_per_order
-    
-    customer_satisfaction = np.random.normal(4.2, 0.4, len(date_range))
-    customer_satisfaction = np.clip(customer_satisfaction, 1, 5)
-    
-    # Create main DataFrame
-    df = pd.DataFrame({
-        'date': date_range,
-        'orders': daily_orders.astype(int),
-        'revenue': daily_revenue,
-        'customer_satisfaction': customer_satisfaction,
-        'new_customers': (daily_orders * np.random.uniform(0.3, 0.7, len(date_range))).astype(int),
-        'returning_customers': (daily_orders * np.random.uniform(0.3, 0.7, len(date_range))).astype(int),
-        'conversion_rate': np.random.normal(3.8, 0.6, len(date_range)),
-        'avg_order_value': revenue_per_order
-    })
-    
-    # Generate department-specific data
-    departments = ['Sales', 'Marketing', 'Operations', 'Customer Service', 'Finance']
-    dept_data = []
-    
-    for dept in departments:
-        performance = np.random.uniform(0.7, 1.3, len(date_range))
-        target_achievement = np.random.normal(95, 10, len(date_range))
-        
-        dept_df = pd.DataFrame({
-            'date': date_range,
-            'department': dept,
-            'performance_score': performance,
-            'target_achievement': np.clip(target_achievement, 60, 130),
-            'team_size': np.random.randint(5, 25),
-            'budget_utilization': np.random.uniform(0.8, 1.1, len(date_range))
-        })
-        dept_data.append(dept_df)
-    
-    dept_df = pd.concat(dept_data, ignore_index=True)
-    
-    return df, dept_df
+    store = get_enterprise_store()
+    store.refresh()
+    
+    monthly_data = store.monthly.reset_index()
+    monthly_data['date'] = monthly_data['date'].astype(str)
+    
+    # Identifies this version of the data, see compute_kpis
+    data_version = f"{store.seed}:{store.origin.date()}:{store.watermark.date()}:{store.version}"
+    return store.main_df, monthly_data, store.dept_means.reset_index(), data_version
+
+# KPI engine shared by every role and page (only the latest data version is kept)
+@st.cache_data(max_entries=1)
+def compute_kpis(_main_df, _dept_means, data_version, period_days=30):
+    """
+    Compute all period-over-period KPIs once per version of the data.
+    
+    The frames are not hashed by Streamlit (leading underscore); the cache
+    is keyed on data_version instead, so widget interactions and role
+    changes reuse the same result. With less than 2 * period_days of data
+    the previous period is shorter (or empty), and growth against an empty
+    previous period is reported as 0.
+    """
+    columns = ['orders', 'revenue', 'customer_satisfaction']
+    values = _main_df[columns].to_numpy(dtype='float64')
+    current_rows = values[-period_days:]
+    current = current_rows.sum(axis=0)
+    previous = values[-2 * period_days:-period_days].sum(axis=0)
+    
+    has_previous = previous > 0
+    growth = np.zeros(len(columns))
+    growth[has_previous] = (current - previous)[has_previous] / previous[has_previous] * 100
+    
+    return {
+        'total_orders_current': int(current[0]),
+        'total_orders_previous': int(previous[0]),
+        'orders_growth': growth[0],
+        'total_revenue_current': current[1],
+        'total_revenue_previous': previous[1],
+        'revenue_growth': growth[1],
+        'avg_satisfaction': current[2] / len(current_rows),
+        'latest_daily_orders': int(values[-1, 0]),
+        'departments': _dept_means.sort_values('target_achievement').reset_index(drop=True),
+        'team': _dept_means[['department', 'performance_score', 'target_achievement',
+                             'team_size', 'budget_utilization']]
+    }
 
 # Load enterprise data
-main_df, dept_df = generate_enterprise_data()
+main_df, monthly_data, dept_means, data_version = generate_enterprise_data()
+
+# How each Data Explorer metric is rolled up, and the resampling rule of each
+# aggregation level (weeks start on Monday, periods are labelled by their first day)
+EXPLORER_AGGREGATIONS = {
+    'orders': 'sum',
+    'revenue': 'sum',
+    'customer_satisfaction': 'mean',
+    'conversion_rate': 'mean'
+}
+EXPLORER_RULES = {'Weekly': 'W-MON', 'Monthly': 'MS'}
+
+# Shared, read-only rollups (cache_resource does not copy them on every rerun).
+# Only the latest data version is kept, older rollups are dropped.
+@st.cache_resource(max_entries=1)
+def build_explorer_rollups(_main_df, data_version):
+    """
+    Daily, weekly and monthly tables for the Data Explorer, each indexed by a
+    sorted DatetimeIndex. Built once per data version.
+    """
+    daily = _main_df.set_index('date')[list(EXPLORER_AGGREGATIONS)].sort_index()
+    rollups = {'Daily': daily}
+    for level, rule in EXPLORER_RULES.items():
+        rollups[level] = daily.resample(rule, label='left', closed='left').agg(EXPLORER_AGGREGATIONS)
+    return rollups
+
+def slice_date_range(table, start, end, rule=None):
+    """
+    Rows of a rollup table whose period overlaps [start, end].
+    
+    Two binary searches on the sorted index give a positional slice, so the
+    cost does not grow with the length of the history. For weekly or monthly
+    tables (`rule`, see EXPLORER_RULES) the period starting before `start`
+    is included when it still contains `start`.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    first = table.index.searchsorted(start, side='left')
+    if rule is not None and first > 0 and table.index[first - 1] + to_offset(rule) > start:
+        first -= 1
+    last = table.index.searchsorted(end, side='right')
+    return table.iloc[first:last]
 
 # Corporate Header
 st.markdown("""
@@ -219,26 +267,21 @@ with nav_col3:
     st.markdown('<div class="nav-container">', unsafe_allow_html=True)
     st.markdown(f"**🕒 Last Updated**<br>{datetime.now().strftime('%H:%M:%S')}", unsafe_allow_html=True)
     if st.button("🔄 Refresh"):
-        st.cache_data.clear()
+        # Only this function's cache: the store then appends the new days
+        generate_enterprise_data.clear()
         st.rerun()
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Page Content Based on Selection
 st.markdown("---")
 
-# Calculate current period metrics
-current_month = main_df.tail(30)
-previous_month = main_df.iloc[-60:-30]
-
-total_orders_current = current_month['orders'].sum()
-total_orders_previous = previous_month['orders'].sum()
-orders_growth = ((total_orders_current - total_orders_previous) / total_orders_previous * 100)
+# Current period metrics (last 30 days vs the 30 days before), cached per data version
+kpis = compute_kpis(main_df, dept_means, data_version)
 
-total_revenue_current = current_month['revenue'].sum()
-total_revenue_previous = previous_month['revenue'].sum()
-revenue_growth = ((total_revenue_current - total_revenue_previous) / total_revenue_previous * 100)
-
-avg_satisfaction = current_month['customer_satisfaction'].mean()
+total_revenue_current = kpis['total_revenue_current']
+revenue_growth = kpis['revenue_growth']
+orders_growth = kpis['orders_growth']
+avg_satisfaction = kpis['avg_satisfaction']
 
 # Dashboard Overview (Common to all roles)
 if selected_page == 'Dashboard Overview':
@@ -292,7 +335,7 @@ if selected_page == 'Dashboard Overview':
         with kpi_col1:
             st.metric(
                 "📦 Daily Orders",
-                f"{current_month['orders'].iloc[-1]:,}",
+                f"{kpis['latest_daily_orders']:,}",
                 f"{orders_growth:+.1f}%"
             )
         
@@ -381,12 +424,6 @@ if selected_page == 'Dashboard Overview':
     
     with chart_col1:
         # Revenue trend
-        monthly_data = main_df.groupby(main_df['date'].dt.to_period('M')).agg({
-            'revenue': 'sum',
-            'orders': 'sum'
-        }).reset_index()
-        monthly_data['date'] = monthly_data['date'].astype(str)
-        
         fig = px.line(
             monthly_data,
             x='date',
@@ -400,10 +437,8 @@ if selected_page == 'Dashboard Overview':
     
     with chart_col2:
         # Department performance
-        latest_dept = dept_df.groupby('department')['target_achievement'].mean().reset_index()
-        
         fig = px.bar(
-            latest_dept.sort_values('target_achievement', ascending=True),
+            kpis['departments'],
             x='target_achievement',
             y='department',
             orientation='h',
@@ -459,12 +494,7 @@ elif selected_page == 'Team Performance' and user_role == 'Manager':
     st.subheader("👨‍💼 Team Performance Dashboard")
     
     # Team performance metrics
-    team_data = dept_df.groupby('department').agg({
-        'performance_score': 'mean',
-        'target_achievement': 'mean',
-        'team_size': 'first',
-        'budget_utilization': 'mean'
-    }).reset_index()
+    team_data = kpis['team']
     
     st.dataframe(
         team_data.style.format({
@@ -502,14 +532,14 @@ elif selected_page == 'Data Explorer' and user_role == 'Analyst':
             ['Daily', 'Weekly', 'Monthly']
         )
     
-    # Display filtered data
+    # Display filtered data, at the selected aggregation level
     if len(date_range) == 2:
-        filtered_data = main_df[
-            (main_df['date'].dt.date >= date_range[0]) &
-            (main_df['date'].dt.date <= date_range[1])
-        ]
+        rollups = build_explorer_rollups(main_df, data_version)
+        filtered_data = slice_date_range(rollups[aggregation], date_range[0], date_range[1],
+                                         EXPLORER_RULES.get(aggregation))
         
-        st.dataframe(filtered_data[['date'] + metric_selection], use_container_width=True)
+        paginated_dataframe(filtered_data[metric_selection].reset_index(), key='explorer',
+                            use_container_width=True)
 
 elif selected_page == 'Sales Performance' and user_role == 'Sales Director':
     st.subheader("💼 Sales Performance Analytics")
@@ -7,6 +7,11 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import time
+import os
+import sys
+# Make the course Utilities package importable (three folders up from this app)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from Utilities.synthetic_data_helper import generate_realtime_data as generate_realtime_frames
 
 # Configure page for wide layout
 st.set_page_config(
@@ -39,57 +44,8 @@ def generate_realtime_data():
     Generate realistic time-series business data.
     In production, this would be replaced with Supabase queries.
     """
-    np.random.seed(int(time.time()) % 1000)  # Semi-random for "real-time" feel
-    
-    # Generate 90 days of hourly data
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=90)
-    date_range = pd.date_range(start_date, end_date, freq='H')
-    
-    # Simulate realistic business patterns
-    base_orders = 50
-    seasonal_pattern = np.sin(np.arange(len(date_range)) * 2 * np.pi / (24 * 7)) * 10  # Weekly pattern
-    daily_pattern = np.sin(np.arange(len(date_range)) * 2 * np.pi / 24) * 20  # Daily pattern
-    growth_trend = np.arange(len(date_range)) * 0.01  # Growth trend
-    noise = np.random.normal(0, 5, len(date_range))
-    
-    orders = base_orders + seasonal_pattern + daily_pattern + growth_trend + noise
-    orders = np.maximum(orders, 5)  # Minimum 5 orders per hour
-    
-    # Generate correlated metrics
-    revenue = orders * np.random.normal(85, 15, len(date_range))
-    satisfaction = np.random.normal(4.2, 0.3, len(date_range))
-    satisfaction = np.clip(satisfaction, 1, 5)
-    
-    # Create DataFrame
-    df = pd.DataFrame({
-        'timestamp': date_range,
-        'orders': orders.astype(int),
-        'revenue': revenue,
-        'satisfaction': satisfaction,
-        'customers': orders * np.random.uniform(0.7, 1.3, len(date_range)),
-        'conversion_rate': np.random.normal(3.5, 0.5, len(date_range))
-    })
-    
-    # Add categorical data
-    categories = ['Electronics', 'Fashion', 'Home & Garden', 'Books', 'Sports']
-    states = ['São Paulo', 'Rio de Janeiro', 'Minas Gerais', 'Bahia', 'Paraná']
-    
-    category_data = []
-    for _, row in df.iterrows():
-        for cat in categories:
-            orders_cat = int(row['orders'] * np.random.uniform(0.1, 0.3))
-            if orders_cat > 0:
-                category_data.append({
-                    'timestamp': row['timestamp'],
-                    'category': cat,
-                    'orders': orders_cat,
-                    'revenue': orders_cat * np.random.uniform(70, 120)
-                })
-    
-    category_df = pd.DataFrame(category_data)
-    
-    return df, category_df
+    # Semi-random for "real-time" feel
+    return generate_realtime_frames(days=90, seed=int(time.time()) % 1000)
 
 # Load data
 df, category_df = generate_realtime_data()
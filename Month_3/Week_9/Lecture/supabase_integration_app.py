@@ -6,6 +6,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
+import sys
+# Make the course Utilities package importable (three folders up from this app)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from Utilities.synthetic_data_helper import format_ids, id_column, table_rng
+from Utilities.streamlit_helper import paginated_dataframe
 
 # Configure page
 st.set_page_config(
@@ -67,26 +72,26 @@ def load_orders_data(supabase_client, limit=1000):
     
     # Simulated query: supabase_client.table('orders').select('*').limit(limit).execute()
     # For demo, generate realistic data
-    np.random.seed(42)
+    rng = table_rng(42, 'supabase_orders')
     
-    dates = pd.date_range('2024-01-01', periods=limit, freq='H')
+    dates = pd.date_range('2024-01-01', periods=limit, freq='h')
     
     data = {
-        'order_id': [f"ORD_{i:08d}" for i in range(1, limit + 1)],
-        'customer_id': [f"CUST_{np.random.randint(1, 10000):06d}" for _ in range(limit)],
+        'order_id': format_ids(np.arange(1, limit + 1), 'ORD_', 8),
+        'customer_id': id_column(rng.integers(1, 10000, limit), 'CUST_', 6),
         'order_date': dates,
-        'product_category': np.random.choice([
+        'product_category': rng.choice([
             'Electronics', 'Fashion', 'Home & Garden', 'Books', 'Sports',
             'Beauty', 'Automotive', 'Toys', 'Health', 'Food'
         ], limit),
-        'order_value': np.random.exponential(100, limit),
-        'customer_state': np.random.choice([
+        'order_value': rng.exponential(100, limit),
+        'customer_state': rng.choice([
             'SP', 'RJ', 'MG', 'BA', 'PR', 'RS', 'PE', 'CE', 'SC', 'GO'
         ], limit),
-        'order_status': np.random.choice([
+        'order_status': rng.choice([
             'completed', 'processing', 'shipped', 'cancelled'
         ], limit, p=[0.8, 0.1, 0.08, 0.02]),
-        'satisfaction_score': np.random.choice([1, 2, 3, 4, 5], limit, p=[0.05, 0.1, 0.2, 0.35, 0.3])
+        'satisfaction_score': rng.choice([1, 2, 3, 4, 5], limit, p=[0.05, 0.1, 0.2, 0.35, 0.3])
     }
     
     df = pd.DataFrame(data)
@@ -332,17 +337,11 @@ if supabase_client:
                 st.write(f"Product Categories: {filtered_orders['product_category'].nunique()}")
         
         with preview_tabs[2]:
-            # Raw data with search
-            search_term = st.text_input("🔍 Search orders (by Order ID or Customer ID):")
-            
-            if search_term:
-                search_results = filtered_orders[
-                    (filtered_orders['order_id'].str.contains(search_term, case=False)) |
-                    (filtered_orders['customer_id'].str.contains(search_term, case=False))
-                ]
-                st.dataframe(search_results, use_container_width=True)
-            else:
-                st.dataframe(filtered_orders.head(20), use_container_width=True)
+            # Raw data with search (by Order ID or Customer ID), one page at a time
+            paginated_dataframe(
+                filtered_orders, key='raw_orders', page_size=20,
+                search_columns=['order_id', 'customer_id'], use_container_width=True
+            )
         
         # Export functionality
         st.markdown("---")
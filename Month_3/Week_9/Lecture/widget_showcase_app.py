@@ -4,6 +4,11 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 from datetime import datetime, timedelta
+import os
+import sys
+# Make the course Utilities package importable (three folders up from this app)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from Utilities.synthetic_data_helper import format_ids
 
 # Configure page
 st.set_page_config(
@@ -29,7 +34,7 @@ def generate_business_data():
     
     data = {
         'date': np.repeat(dates, 3),  # 3 records per day
-        'customer_id': [f"CUST_{i:06d}" for i in range(1, len(dates)*3 + 1)],
+        'customer_id': format_ids(np.arange(1, len(dates)*3 + 1), 'CUST_', 6),
         'product_category': np.random.choice([
             'Electronics', 'Fashion', 'Home & Garden', 'Books', 'Sports', 
             'Beauty', 'Automotive', 'Toys', 'Health', 'Food'
@@ -0,0 +1,42 @@
+# Course Utilities
+# Helper modules are only imported when first used (PEP 562), so
+# `import Utilities` stays fast and does not load pandas or matplotlib.
+
+import importlib
+
+# Helper modules in this package
+_SUBMODULES = ['colab_helper', 'olist_helper', 'streamlit_helper', 'synthetic_data_helper',
+               'visualization_helper']
+
+# Functions that can be used directly as Utilities.<name>, and their module
+_EXPORTS = {
+    'load_github_data': 'colab_helper',
+    'setup_colab': 'colab_helper',
+    'load_olist_data': 'olist_helper',
+    'load_olist_tables': 'olist_helper',
+    'join_order_data': 'olist_helper',
+    'calculate_delivery_time': 'olist_helper',
+    'set_plotting_style': 'visualization_helper',
+    'plot_numeric_distribution': 'visualization_helper',
+    'plot_categorical_distribution': 'visualization_helper',
+    'plot_time_series': 'visualization_helper'
+}
+
+def __getattr__(name):
+    """
+    Import helper modules and exported functions on first access
+    """
+    if name in _SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    elif name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    # Cache it so __getattr__ is not called again for this name
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_EXPORTS))
@@ -1,44 +1,416 @@
 # Colab Helper Functions
 # This file contains helper functions for working with Google Colab
 
-def load_github_data(file_path):
+import io
+import os
+
+# Raw file URL of the course repository
+GITHUB_BASE_URL = 'https://raw.githubusercontent.com/autom8or-com/python-data-analysis-course/main/'
+
+# Local mirror of downloaded files. Files are stored by content hash in
+# 'objects/', and 'index.json' maps each URL to its hash, ETag and Last-Modified.
+GITHUB_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'python-data-analysis-course')
+
+# Set the environment variable COURSE_DATA_OFFLINE=1 to only use the local mirror
+OFFLINE = os.environ.get('COURSE_DATA_OFFLINE', '') not in ('', '0')
+
+# Extensions load_github_data returns as decoded text; other non-CSV files
+# (zip, parquet, images, ...) are returned as raw bytes
+TEXT_EXTENSIONS = ['.txt', '.md', '.json', '.py', '.sql', '.tsv', '.html', '.xml',
+                   '.yml', '.yaml', '.ipynb']
+
+# Whether setup_colab has already applied the display and plot settings
+_SETUP_DONE = False
+
+def _read_cache_index():
+    """
+    Load the URL -> cached file index of the local mirror
+    """
+    import json
+    
+    try:
+        with open(os.path.join(GITHUB_CACHE_DIR, 'index.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _write_cache_entry(url, content, headers, encoding):
+    """
+    Store a downloaded file in the local mirror and record it in the index
+    """
+    import hashlib
+    import json
+    
+    digest = hashlib.sha256(content).hexdigest()
+    objects_dir = os.path.join(GITHUB_CACHE_DIR, 'objects')
+    os.makedirs(objects_dir, exist_ok=True)
+    
+    object_path = os.path.join(objects_dir, digest)
+    if not os.path.exists(object_path):
+        tmp_path = f"{object_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, object_path)
+    
+    index = _read_cache_index()
+    index[url] = {
+        'sha256': digest,
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+        'encoding': encoding
+    }
+    index_path = os.path.join(GITHUB_CACHE_DIR, 'index.json')
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_path, index_path)
+
+def _read_cache_entry(entry):
+    """
+    Return the cached bytes for an index entry (None if the file is gone)
+    """
+    try:
+        with open(os.path.join(GITHUB_CACHE_DIR, 'objects', entry['sha256']), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def _fetch_github_file(file_path, use_cache=True, offline=None, base_url=None):
+    """
+    Return (bytes, encoding) for a repository file, using the local mirror
+    
+    Cached files are revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged file is not downloaded again. If the server cannot be reached,
+    the cached copy is used.
+    """
+    import requests
+    
+    if offline is None:
+        offline = OFFLINE
+    full_url = (base_url or GITHUB_BASE_URL) + file_path
+    
+    entry = _read_cache_index().get(full_url) if use_cache else None
+    cached = _read_cache_entry(entry) if entry else None
+    
+    if offline:
+        if cached is None:
+            raise FileNotFoundError(f"{file_path} is not in the local data mirror. "
+                                    f"Load it once while online to add it.")
+        return cached, entry['encoding']
+    
+    headers = {}
+    if cached is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    try:
+        response = requests.get(full_url, headers=headers)
+    except requests.ConnectionError:
+        if cached is None:
+            raise
+        return cached, entry['encoding']
+    
+    if response.status_code == 304 and cached is not None:
+        return cached, entry['encoding']
+    
+    response.raise_for_status()  # Raise an exception for HTTP errors
+    
+    content = response.content
+    encoding = response.encoding or 'utf-8'
+    if use_cache:
+        try:
+            _write_cache_entry(full_url, content, response.headers, encoding)
+        except OSError:
+            # A read-only home folder should not stop the data from loading
+            pass
+    
+    return content, encoding
+
+def load_github_data(file_path, use_cache=True, offline=None, base_url=None):
     """
     Load data directly from GitHub repository
     
+    Downloaded files are kept in a local mirror (GITHUB_CACHE_DIR). Later
+    calls only check with the server whether the file changed, and with
+    offline=True (or COURSE_DATA_OFFLINE=1) the mirror is used without
+    any network access.
+    
     Parameters:
     -----------
     file_path : str
         Path to the file in the repository (e.g., 'Resources/data/sample_customers.csv')
+    use_cache : bool, default=True
+        Whether to read from (and write to) the local mirror
+    offline : bool, optional
+        Only use the local mirror (default: the OFFLINE setting)
+    base_url : str, optional
+        URL the file path is appended to (default: GITHUB_BASE_URL)
     
     Returns:
     --------
-    pandas.DataFrame or str
-        Loaded data, as DataFrame for CSV files or string for text files
+    pandas.DataFrame, str or bytes
+        Loaded data, as DataFrame for CSV files, string for text files (see
+        TEXT_EXTENSIONS) or bytes for anything else
     """
     import pandas as pd
-    import requests
-    from io import StringIO
-    
-    base_url = 'https://raw.githubusercontent.com/autom8or-com/python-data-analysis-course/main/'
-    full_url = base_url + file_path
+    from io import BytesIO
     
-    response = requests.get(full_url)
-    response.raise_for_status()  # Raise an exception for HTTP errors
+    content, encoding = _fetch_github_file(file_path, use_cache=use_cache,
+                                           offline=offline, base_url=base_url)
     
     if file_path.endswith('.csv'):
-        return pd.read_csv(StringIO(response.text))
+        # Parse the raw bytes directly, without decoding to a str first
+        return pd.read_csv(BytesIO(content), encoding=encoding)
+    elif os.path.splitext(file_path)[1].lower() in TEXT_EXTENSIONS:
+        return content.decode(encoding)
     else:
-        return response.text
+        return content
+
+class _ChunkStream(io.RawIOBase):
+    """
+    Read-only file object over an iterator of byte chunks
+    
+    Lets pd.read_csv parse data while it is still being downloaded.
+    """
+    
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b''
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+def _iter_gunzip(chunks):
+    """
+    Decompress a stream of gzip bytes chunk by chunk
+    """
+    import zlib
+    
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        while chunk:
+            yield decompressor.decompress(chunk)
+            # A .gz file can hold several gzip members back to back
+            if decompressor.eof:
+                chunk = decompressor.unused_data
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            else:
+                chunk = b''
+    yield decompressor.flush()
+
+def _iter_unzip(chunks, member=None):
+    """
+    Decompress one file of a zip archive from a stream of bytes
+    
+    The archive is read front to back using the local file headers, so it
+    does not need to be seekable (or saved to disk). Files before the wanted
+    one are skipped without being decompressed where their size is known.
+    
+    member : name of the file to extract (default: the first .csv file)
+    """
+    import struct
+    import zlib
+    
+    chunks = iter(chunks)
+    buffer = bytearray()
+    
+    def fill(size):
+        # Read from the stream until the buffer holds at least `size` bytes
+        while len(buffer) < size:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            buffer.extend(chunk)
+        return True
+    
+    while True:
+        if not fill(4) or bytes(buffer[:4]) != b'PK\x03\x04':
+            # Reached the central directory (or the end) without a match
+            raise ValueError(f"No file {member or 'ending in .csv'} found in the zip archive")
+        
+        if not fill(30):
+            raise ValueError("The zip archive is truncated")
+        flags, method = struct.unpack('<HH', buffer[6:10])
+        compressed_size, uncompressed_size = struct.unpack('<II', buffer[18:26])
+        name_length, extra_length = struct.unpack('<HH', buffer[26:30])
+        if not fill(30 + name_length + extra_length):
+            raise ValueError("The zip archive is truncated")
+        name = bytes(buffer[30:30 + name_length]).decode('utf-8', errors='replace')
+        extra = bytes(buffer[30 + name_length:30 + name_length + extra_length])
+        del buffer[:30 + name_length + extra_length]
+        
+        # Large (zip64) entries keep their real sizes in an extra field
+        zip64 = compressed_size == 0xFFFFFFFF or uncompressed_size == 0xFFFFFFFF
+        position = 0
+        while zip64 and position + 4 <= len(extra):
+            header_id, data_size = struct.unpack('<HH', extra[position:position + 4])
+            if header_id == 0x0001:
+                sizes = extra[position + 4:position + 4 + data_size]
+                if uncompressed_size == 0xFFFFFFFF:
+                    sizes = sizes[8:]
+                if compressed_size == 0xFFFFFFFF:
+                    compressed_size = struct.unpack('<Q', sizes[:8])[0]
+                break
+            position += 4 + data_size
+        
+        wanted = name == member if member is not None else name.endswith('.csv')
+        size_known = not flags & 0x08
+        if method not in (0, 8) or (method == 0 and not size_known) \
+                or compressed_size == 0xFFFFFFFF:
+            raise ValueError(f"Unsupported zip entry format for {name}")
+        
+        if size_known and not wanted:
+            # Skip the compressed data of files we do not need
+            remaining = compressed_size
+            while remaining:
+                if not fill(1):
+                    raise ValueError("The zip archive is truncated")
+                skipped = min(remaining, len(buffer))
+                del buffer[:skipped]
+                remaining -= skipped
+        elif method == 0:
+            remaining = compressed_size
+            while remaining:
+                if not fill(1):
+                    raise ValueError("The zip archive is truncated")
+                data = bytes(buffer[:remaining])
+                del buffer[:len(data)]
+                remaining -= len(data)
+                yield data
+        else:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            while not decompressor.eof:
+                if not buffer and not fill(1):
+                    raise ValueError("The zip archive is truncated")
+                data = bytes(buffer)
+                buffer.clear()
+                output = decompressor.decompress(data)
+                if wanted and output:
+                    yield output
+            # Put back whatever followed the end of the compressed data
+            buffer[:0] = decompressor.unused_data
+        
+        if not size_known:
+            # Skip the data descriptor (with or without its signature)
+            descriptor_size = 20 if zip64 else 12
+            fill(descriptor_size + 4)
+            if bytes(buffer[:4]) == b'PK\x07\x08':
+                descriptor_size += 4
+            del buffer[:descriptor_size]
+        
+        if wanted:
+            return
+
+def stream_github_data(file_path, chunksize=100000, member=None, compression='infer',
+                       offline=None, base_url=None, block_size=1024 * 1024):
+    """
+    Load a large CSV file from the GitHub repository in chunks
+    
+    The download is streamed and parsed while it arrives, so the whole
+    file is never held in memory. Gzip (.gz) and zip (.zip) files are
+    decompressed on the fly, without writing temporary files. Streamed
+    files are not added to the local mirror, but with offline=True a file
+    already in the mirror is streamed from disk.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the file in the repository (e.g., 'Resources/data/marketing_funnel.zip')
+    chunksize : int, default=100000
+        Number of rows per DataFrame chunk
+    member : str, optional
+        For zip files, the name of the CSV file inside the archive
+        (default: the first .csv file)
+    compression : {'infer', 'gzip', 'zip', None}, default='infer'
+        Compression of the file; 'infer' uses the file extension
+    offline : bool, optional
+        Only use the local mirror (default: the OFFLINE setting)
+    base_url : str, optional
+        URL the file path is appended to (default: GITHUB_BASE_URL)
+    block_size : int, default=1MB
+        Number of bytes to read from the network at a time
+    
+    Yields:
+    -------
+    pandas.DataFrame
+        The next chunk of rows
+    
+    Examples:
+    ---------
+    >>> for chunk in stream_github_data('Resources/data/marketing_funnel.zip',
+    ...                                 member='olist_closed_deals_dataset.csv'):
+    ...     print(len(chunk))
+    """
+    import pandas as pd
+    import requests
+    
+    if offline is None:
+        offline = OFFLINE
+    if compression == 'infer':
+        compression = {'.gz': 'gzip', '.zip': 'zip'}.get(os.path.splitext(file_path)[1])
+    if compression not in ('gzip', 'zip', None):
+        raise ValueError(f"Unsupported compression: {compression}")
+    
+    full_url = (base_url or GITHUB_BASE_URL) + file_path
+    
+    def read_blocks():
+        if offline:
+            entry = _read_cache_index().get(full_url)
+            object_path = os.path.join(GITHUB_CACHE_DIR, 'objects', entry['sha256']) if entry else None
+            if object_path is None or not os.path.exists(object_path):
+                raise FileNotFoundError(f"{file_path} is not in the local data mirror. "
+                                        f"Load it once while online to add it.")
+            with open(object_path, 'rb') as f:
+                yield from iter(lambda: f.read(block_size), b'')
+        else:
+            with requests.get(full_url, stream=True) as response:
+                response.raise_for_status()  # Raise an exception for HTTP errors
+                yield from response.iter_content(chunk_size=block_size)
+    
+    blocks = read_blocks()
+    if compression == 'gzip':
+        blocks = _iter_gunzip(blocks)
+    elif compression == 'zip':
+        blocks = _iter_unzip(blocks, member=member)
+    
+    stream = io.BufferedReader(_ChunkStream(blocks), buffer_size=block_size)
+    with pd.read_csv(stream, chunksize=chunksize) as reader:
+        yield from reader
 
-def setup_colab():
+def setup_colab(force=False):
     """
     Set up Colab environment with common imports and display settings
+    
+    The settings are only applied on the first call; later calls just
+    return the packages.
+    
+    Parameters:
+    -----------
+    force : bool, default=False
+        Apply the settings again
     """
+    global _SETUP_DONE
     import pandas as pd
     import numpy as np
     import matplotlib.pyplot as plt
     import seaborn as sns
     
+    if _SETUP_DONE and not force:
+        return pd, np, plt, sns
+    
     # Display settings
     pd.set_option('display.max_columns', None)
     pd.set_option('display.max_rows', 100)
@@ -48,6 +420,8 @@ def setup_colab():
     plt.style.use('seaborn-v0_8-whitegrid')
     sns.set(font_scale=1.2)
     
+    _SETUP_DONE = True
+    
     # Return common packages for use
     return pd, np, plt, sns
 
@@ -1,14 +1,512 @@
 # Olist Dataset Helper Functions
 # This file contains helper functions for working with the Olist dataset
 
-def load_olist_data(table_name):
+# Folder containing the Olist CSV files
+DATA_DIR = 'Data'
+
+# Folder for the columnar (Parquet) copies of the CSV files
+CACHE_DIR = 'Data/.cache'
+
+# Map of table names to file names
+TABLE_MAP = {
+    'customers': 'olist_customers_dataset.csv',
+    'orders': 'olist_orders_dataset.csv',
+    'order_items': 'olist_order_items_dataset.csv',
+    'products': 'olist_products_dataset.csv',
+    'sellers': 'olist_sellers_dataset.csv',
+    'order_payments': 'olist_order_payments_dataset.csv',
+    'order_reviews': 'olist_order_reviews_dataset.csv',
+    'categories': 'product_category_name_translation.csv'
+}
+
+# Column types applied when each table is parsed.
+# 'dtype' is passed to pd.read_csv and 'parse_dates' lists the timestamp columns.
+# Low-cardinality text columns become 'category' and small counts use narrow integers.
+TABLE_SCHEMAS = {
+    'customers': {
+        'dtype': {
+            'customer_zip_code_prefix': 'int32',
+            'customer_city': 'category',
+            'customer_state': 'category'
+        },
+        'parse_dates': []
+    },
+    'orders': {
+        'dtype': {
+            'order_status': 'category'
+        },
+        'parse_dates': [
+            'order_purchase_timestamp',
+            'order_approved_at',
+            'order_delivered_carrier_date',
+            'order_delivered_customer_date',
+            'order_estimated_delivery_date'
+        ]
+    },
+    'order_items': {
+        'dtype': {
+            'order_item_id': 'int8',
+            'price': 'float64',
+            'freight_value': 'float64'
+        },
+        'parse_dates': ['shipping_limit_date']
+    },
+    'products': {
+        'dtype': {
+            'product_category_name': 'category',
+            'product_name_lenght': 'float32',
+            'product_description_lenght': 'float32',
+            'product_photos_qty': 'float32',
+            'product_weight_g': 'float32',
+            'product_length_cm': 'float32',
+            'product_height_cm': 'float32',
+            'product_width_cm': 'float32'
+        },
+        'parse_dates': []
+    },
+    'sellers': {
+        'dtype': {
+            'seller_zip_code_prefix': 'int32',
+            'seller_city': 'category',
+            'seller_state': 'category'
+        },
+        'parse_dates': []
+    },
+    'order_payments': {
+        'dtype': {
+            'payment_sequential': 'int8',
+            'payment_type': 'category',
+            'payment_installments': 'int8',
+            'payment_value': 'float64'
+        },
+        'parse_dates': []
+    },
+    'order_reviews': {
+        'dtype': {
+            'review_score': 'int8'
+        },
+        'parse_dates': ['review_creation_date', 'review_answer_timestamp']
+    },
+    'categories': {
+        'dtype': {},
+        'parse_dates': []
+    }
+}
+
+# Rows per Parquet row group; small groups let filters skip more of the file
+CACHE_ROW_GROUP_SIZE = 25000
+
+# Rows per chunk when filtering a CSV file without the cache
+CSV_CHUNK_SIZE = 100000
+
+# Format of the timestamps in the Olist CSV files
+DATE_FORMAT = 'ISO8601'
+
+# Bump this whenever TABLE_SCHEMAS changes so old cache files are not reused
+SCHEMA_VERSION = 1
+
+# Bump this whenever join_order_data changes so the cached join is rebuilt
+JOIN_VERSION = 1
+
+# Join key used when adding each table to the joined order data
+JOIN_KEYS = {
+    'products': 'product_id',
+    'sellers': 'seller_id',
+    'order_payments': 'order_id',
+    'order_reviews': 'order_id'
+}
+
+# How the tables link together, as a tree rooted at 'orders'.
+# Each entry is (child table, join key, kind): 'lookup' children have one row
+# per key (dimensions), 'fanout' children can have several rows per key.
+JOIN_TREE = {
+    'orders': [
+        ('customers', 'customer_id', 'lookup'),
+        ('order_reviews', 'order_id', 'fanout'),
+        ('order_payments', 'order_id', 'fanout'),
+        ('order_items', 'order_id', 'fanout')
+    ],
+    'order_items': [
+        ('products', 'product_id', 'lookup'),
+        ('sellers', 'seller_id', 'lookup')
+    ],
+    'products': [
+        ('categories', 'product_category_name', 'lookup')
+    ]
+}
+
+# How 'fanout' tables are reduced to one row per order when joining at order level.
+# Keys are output column names, values are (source column, function); the names
+# carry the function so they are not mistaken for the per-row columns. Columns
+# not listed here have no per-order value and are dropped at order level.
+ORDER_LEVEL_AGGREGATIONS = {
+    'order_items': {
+        'item_count': ('order_item_id', 'count'),
+        'price_sum': ('price', 'sum'),
+        'freight_value_sum': ('freight_value', 'sum')
+    },
+    'order_payments': {
+        'payment_count': ('payment_sequential', 'count'),
+        'payment_value_sum': ('payment_value', 'sum'),
+        'payment_installments_max': ('payment_installments', 'max')
+    },
+    'order_reviews': {
+        'review_count': ('review_id', 'count'),
+        'review_score_mean': ('review_score', 'mean')
+    }
+}
+
+# 32-character hash ID columns that can be replaced by int32 surrogate keys
+ID_COLUMNS = [
+    'order_id',
+    'customer_id',
+    'customer_unique_id',
+    'product_id',
+    'seller_id',
+    'review_id'
+]
+
+# Surrogate key lookup for each ID column, shared by all tables in this session
+# so that e.g. order_id 17 means the same order in 'orders' and 'order_items'
+_ID_REGISTRY = {}
+
+# In-memory copy of the joined order data and its factorised join keys,
+# kept for the latest fingerprint only (see extend_order_data)
+_JOIN_INDEX = {}
+
+# Bump this whenever prepare_satisfaction_data changes so the prepared
+# satisfaction dataset is rebuilt
+SATISFACTION_VERSION = 1
+
+# Tables the prepared satisfaction dataset is built from
+SATISFACTION_TABLES = ['orders', 'order_reviews', 'customers']
+
+# Deliveries taking longer than this many days are dropped as outliers
+MAX_DELIVERY_DAYS = 100
+
+def _table_path(table_name):
+    """
+    Return the CSV path for a table, checking that the table name is valid
+    """
+    import os
+    
+    # Check if table name is valid
+    if table_name not in TABLE_MAP:
+        raise ValueError(f"Invalid table name. Valid options are: {list(TABLE_MAP.keys())}")
+    
+    return os.path.join(DATA_DIR, TABLE_MAP[table_name])
+
+def _missing_file_error(table_name):
+    """
+    Build the error raised when a table's CSV file is not in the Data folder
+    """
+    filename = TABLE_MAP[table_name]
+    return FileNotFoundError(f"The file {filename} was not found in the Data folder. "
+                             f"Please ensure the file exists in the correct location.")
+
+def _cache_path(csv_path):
+    """
+    Return the Parquet cache path for a CSV file.
+    
+    The name includes a hash of the file path, modification time, size and
+    schema version, so editing or replacing the CSV (or changing TABLE_SCHEMAS)
+    automatically points to a new cache file.
+    """
+    import os
+    
+    digest = _fingerprint([csv_path])
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(CACHE_DIR, f"{stem}-{digest}.parquet")
+
+def _fingerprint(csv_paths, version=''):
+    """
+    Hash the path, modification time and size of one or more CSV files
+    
+    Raises FileNotFoundError if any of the files is missing.
+    """
+    import hashlib
+    import os
+    
+    parts = [str(SCHEMA_VERSION), str(version)]
+    for csv_path in csv_paths:
+        stat = os.stat(csv_path)
+        parts.append(f"{os.path.abspath(csv_path)}|{stat.st_mtime_ns}|{stat.st_size}")
+    
+    key = '|'.join(parts)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def _write_cache(df, cache_path):
+    """
+    Save a DataFrame to the Parquet cache and remove stale copies of the same table
+    """
+    import glob
+    import os
+    
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    
+    # Drop cache files left behind by older versions of the CSV
+    stem = os.path.basename(cache_path).rsplit('-', 1)[0]
+    for old_path in glob.glob(os.path.join(CACHE_DIR, f"{stem}-*.parquet")):
+        if old_path != cache_path:
+            os.remove(old_path)
+    
+    # Write to a temporary file first so readers never see a half-written cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False, row_group_size=CACHE_ROW_GROUP_SIZE)
+    os.replace(tmp_path, cache_path)
+
+def _remove_cache(cache_path):
+    """
+    Delete a damaged cache file so the next load rebuilds it
+    """
+    import os
+    
+    try:
+        os.remove(cache_path)
+    except OSError:
+        # Already gone, or the Data folder is read-only
+        pass
+
+def _has_parquet_engine():
+    """
+    Check whether pyarrow is installed (needed for the Parquet cache)
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _normalize_filters(table_name, filters):
+    """
+    Check a list of (column, op, value) filters and convert timestamp values
+    
+    Values for timestamp columns may be given as strings (e.g. '2018-01-01');
+    they are converted to pandas Timestamps so they compare correctly.
+    """
+    import pandas as pd
+    
+    if not filters:
+        return None
+    
+    date_columns = TABLE_SCHEMAS[table_name]['parse_dates']
+    valid_ops = ['==', '=', '!=', '<', '<=', '>', '>=', 'in', 'not in']
+    
+    normalized = []
+    for column, op, value in filters:
+        if op not in valid_ops:
+            raise ValueError(f"Unsupported filter operator '{op}'. Valid options are: {valid_ops}")
+        
+        if column in date_columns:
+            if op in ('in', 'not in'):
+                value = [pd.Timestamp(v) for v in value]
+            else:
+                value = pd.Timestamp(value)
+        elif op in ('in', 'not in'):
+            value = list(value)
+        
+        normalized.append((column, op, value))
+    
+    return normalized
+
+def _apply_filters(df, filters):
+    """
+    Keep only the rows of a DataFrame that match every (column, op, value) filter
+    """
+    import operator
+    import numpy as np
+    
+    if not filters:
+        return df
+    
+    compare = {
+        '==': operator.eq,
+        '=': operator.eq,
+        '!=': operator.ne,
+        '<': operator.lt,
+        '<=': operator.le,
+        '>': operator.gt,
+        '>=': operator.ge
+    }
+    
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        if op == 'in':
+            mask &= df[column].isin(value).to_numpy()
+        elif op == 'not in':
+            mask &= (~df[column].isin(value) & df[column].notna()).to_numpy()
+        else:
+            # Missing values never match, as with Parquet filters
+            mask &= compare[op](df[column], value).fillna(False).to_numpy(dtype=bool)
+    
+    return df[mask]
+
+def _select(df, columns=None, filters=None):
+    """
+    Apply filters and then keep only the requested columns
+    """
+    df = _apply_filters(df, filters)
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
+
+def _restore_categories(table_name, df):
+    """
+    Convert schema 'category' columns back to category after concatenating chunks
+    
+    Chunks read separately have different category sets, and pd.concat turns
+    such columns back into plain text.
+    """
+    category_columns = {
+        col: 'category'
+        for col, dtype in TABLE_SCHEMAS[table_name]['dtype'].items()
+        if dtype == 'category' and col in df.columns and df[col].dtype != 'category'
+    }
+    if category_columns:
+        df = df.astype(category_columns)
+    return df
+
+def _read_csv_typed(table_name, csv_path, columns=None, filters=None):
+    """
+    Parse a table's CSV file using its entry in TABLE_SCHEMAS
+    
+    Only the requested columns (plus any filter columns) are parsed. When
+    filters are given the file is read in chunks and each chunk is filtered
+    straight away, so the full table is never held in memory.
+    """
+    import pandas as pd
+    
+    schema = TABLE_SCHEMAS[table_name]
+    header = pd.read_csv(csv_path, nrows=0).columns
+    
+    usecols = None
+    if columns is not None:
+        filter_columns = [column for column, _, _ in filters or []]
+        usecols = list(dict.fromkeys(list(columns) + filter_columns))
+    
+    # Only parse timestamp columns that are actually being read
+    parse_dates = [
+        col for col in schema['parse_dates']
+        if col in header and (usecols is None or col in usecols)
+    ]
+    read_options = dict(dtype=schema['dtype'], parse_dates=parse_dates, usecols=usecols)
+    
+    if not filters:
+        df = pd.read_csv(csv_path, **read_options)
+    else:
+        chunks = [
+            _apply_filters(chunk, filters)
+            for chunk in pd.read_csv(csv_path, chunksize=CSV_CHUNK_SIZE, **read_options)
+        ]
+        df = _restore_categories(table_name, pd.concat(chunks, ignore_index=True))
+    
+    if columns is not None or filters:
+        df = _select(df, columns)
+    
+    return df
+
+def intern_ids(df):
+    """
+    Replace 32-character hash ID columns with int32 surrogate keys
+    
+    The same ID always gets the same key within a Python session, so interned
+    tables can still be merged with each other. Use `decode_ids` to get the
+    original strings back.
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame containing one or more of the ID_COLUMNS
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Copy of the DataFrame with int32 ID columns
+    """
+    import numpy as np
+    import pandas as pd
+    
+    df = df.copy()
+    
+    for col in ID_COLUMNS:
+        if col not in df.columns:
+            continue
+        
+        known = _ID_REGISTRY.get(col, pd.Index([], dtype=object))
+        values = df[col].astype(object)
+        
+        # Give new IDs the next free keys
+        new_ids = pd.Index(values.dropna().unique()).difference(known)
+        if len(new_ids) > 0:
+            known = known.append(new_ids)
+            if len(known) > np.iinfo('int32').max:
+                raise OverflowError(f"Too many distinct values in {col} for int32 keys")
+            _ID_REGISTRY[col] = known
+        
+        # Missing IDs are kept as -1
+        df[col] = known.get_indexer(values).astype('int32')
+    
+    return df
+
+def decode_ids(keys, column):
+    """
+    Convert int32 surrogate keys back to the original hash IDs
+    
+    Parameters:
+    -----------
+    keys : array-like of int
+        Surrogate keys produced by `intern_ids`
+    column : str
+        Name of the ID column the keys came from (e.g., 'order_id')
+    
+    Returns:
+    --------
+    numpy.ndarray
+        Original ID strings (None where the key is -1)
+    """
+    import numpy as np
+    
+    if column not in _ID_REGISTRY:
+        raise ValueError(f"No IDs have been interned for column '{column}'")
+    
+    keys = np.asarray(keys)
+    known = _ID_REGISTRY[column].to_numpy(dtype=object)
+    result = np.full(len(keys), None, dtype=object)
+    valid = keys >= 0
+    result[valid] = known[keys[valid]]
+    return result
+
+def load_olist_data(table_name, use_cache=True, intern=False, columns=None, filters=None):
     """
     Load a specific Olist dataset table
     
+    The first load of a table parses the CSV and saves a Parquet copy in
+    `Data/.cache`; later loads read the Parquet copy, which is much faster
+    and keeps the column dtypes. The cache is rebuilt whenever the CSV
+    file changes. If pyarrow is not installed the CSV is always used.
+    
+    Columns are typed using TABLE_SCHEMAS (categories, narrow integers and
+    parsed timestamps), which uses far less memory than the read_csv defaults.
+    
+    `columns` and `filters` are pushed down into the reader: only the listed
+    columns are decoded, Parquet row groups that cannot match the filters are
+    skipped, and CSV files are filtered chunk by chunk.
+    
     Parameters:
     -----------
     table_name : str
         Name of the table to load (e.g., 'customers', 'orders')
+    use_cache : bool, default=True
+        Whether to read from (and write to) the Parquet cache
+    intern : bool, default=False
+        Whether to replace hash ID columns with int32 keys (see `intern_ids`)
+    columns : list of str, optional
+        Columns to load (default: all columns)
+    filters : list of tuple, optional
+        Row filters as (column, op, value) tuples that must all be true, e.g.
+        [('order_purchase_timestamp', '>=', '2018-06-01'),
+         ('customer_state', 'in', ['SP', 'RJ'])].
+        Supported operators: ==, !=, <, <=, >, >=, in, not in
     
     Returns:
     --------
@@ -16,98 +514,1325 @@ def load_olist_data(table_name):
         Loaded data table
     """
     import pandas as pd
-    import io
+    
+    csv_path = _table_path(table_name)
+    
+    try:
+        # Check the file exists in the Data folder (the cache name depends on it)
+        cache_path = _cache_path(csv_path)
+    except FileNotFoundError:
+        # If not available, raise an error with instructions
+        raise _missing_file_error(table_name)
+    
+    use_cache = use_cache and _has_parquet_engine()
+    filters = _normalize_filters(table_name, filters)
+    
+    df = None
+    if use_cache:
+        try:
+            df = pd.read_parquet(cache_path, columns=columns, filters=filters)
+        except FileNotFoundError:
+            # No cache yet: build it from the CSV below
+            pass
+        except (OSError, ValueError):
+            # A damaged or truncated cache (pyarrow raises ArrowInvalid, a
+            # ValueError): drop it and rebuild it from the CSV below
+            _remove_cache(cache_path)
+    
+    if df is None and use_cache:
+        # Parse the whole table once to build the cache, then select from it
+        df = _read_csv_typed(table_name, csv_path)
+        try:
+            _write_cache(df, cache_path)
+        except OSError:
+            # A read-only Data folder should not stop the data from loading
+            pass
+        if columns is not None or filters:
+            df = _select(df, columns, filters)
+    elif df is None:
+        df = _read_csv_typed(table_name, csv_path, columns=columns, filters=filters)
+    
+    if intern:
+        df = intern_ids(df)
+    
+    return df
+
+def _build_cache_worker(table_name, data_dir, cache_dir):
+    """
+    Parse one table and write its Parquet cache (runs in a worker process)
+    
+    Returns True if the cache was written, False otherwise.
+    """
+    global DATA_DIR, CACHE_DIR
     import os
     
-    # Map of table names to file names
-    table_map = {
-        'customers': 'olist_customers_dataset.csv',
-        'orders': 'olist_orders_dataset.csv',
-        'order_items': 'olist_order_items_dataset.csv',
-        'products': 'olist_products_dataset.csv',
-        'sellers': 'olist_sellers_dataset.csv',
-        'order_payments': 'olist_order_payments_dataset.csv',
-        'order_reviews': 'olist_order_reviews_dataset.csv',
-        'categories': 'product_category_name_translation.csv'
-    }
+    # Worker processes may not share the parent's settings
+    DATA_DIR = data_dir
+    CACHE_DIR = cache_dir
     
-    # Check if table name is valid
-    if table_name not in table_map:
-        raise ValueError(f"Invalid table name. Valid options are: {list(table_map.keys())}")
+    csv_path = _table_path(table_name)
+    cache_path = _cache_path(csv_path)
+    if not os.path.exists(cache_path):
+        try:
+            _write_cache(_read_csv_typed(table_name, csv_path), cache_path)
+        except OSError:
+            return False
+    return True
+
+def _load_table_worker(table_name, data_dir, cache_dir):
+    """
+    Load one table without the cache (runs in a worker process)
+    """
+    global DATA_DIR, CACHE_DIR
+    DATA_DIR = data_dir
+    CACHE_DIR = cache_dir
+    return load_olist_data(table_name, use_cache=False)
+
+def load_olist_tables(table_names, workers=None, use_cache=True):
+    """
+    Load several Olist tables at once, parsing them in parallel
+    
+    Tables without a Parquet cache are parsed in separate processes, and each
+    worker writes its table to the cache instead of sending the DataFrame back
+    (so nothing large is pickled). The cached tables are then read with a
+    thread pool, since the Parquet reader releases the GIL. The total time is
+    roughly that of the largest table rather than the sum of all of them.
+    
+    Without pyarrow (or with use_cache=False) the worker processes return
+    the DataFrames directly.
+    
+    Parameters:
+    -----------
+    table_names : list of str
+        Tables to load (e.g., ['orders', 'order_reviews', 'customers'])
+    workers : int, optional
+        Maximum number of processes/threads (default: number of CPUs)
+    use_cache : bool, default=True
+        Whether to read from (and write to) the Parquet cache
+    
+    Returns:
+    --------
+    dict
+        Table name -> pandas.DataFrame
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    
+    table_names = list(dict.fromkeys(table_names))
+    for table_name in table_names:
+        csv_path = _table_path(table_name)
+        if not os.path.exists(csv_path):
+            raise _missing_file_error(table_name)
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(table_names)))
+    
+    if workers == 1:
+        return {name: load_olist_data(name, use_cache=use_cache) for name in table_names}
+    
+    use_cache = use_cache and _has_parquet_engine()
+    
+    if not use_cache:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(_load_table_worker, name, DATA_DIR, CACHE_DIR)
+                       for name in table_names}
+            return {name: future.result() for name, future in futures.items()}
+    
+    # Parse the tables that have no cache yet in worker processes
+    missing = [name for name in table_names
+               if not os.path.exists(_cache_path(_table_path(name)))]
+    if len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+            futures = [pool.submit(_build_cache_worker, name, DATA_DIR, CACHE_DIR)
+                       for name in missing]
+            for future in futures:
+                future.result()
+    
+    # Read every table (from the cache where it exists) in threads
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(load_olist_data, name) for name in table_names}
+        return {name: future.result() for name, future in futures.items()}
+
+def iter_olist_data(table_name, chunksize=CSV_CHUNK_SIZE, columns=None, filters=None, use_cache=True):
+    """
+    Read an Olist table in chunks, for tables that do not fit in memory
+    
+    Each chunk is a typed DataFrame (see TABLE_SCHEMAS). If a Parquet cache of
+    the table already exists it is read batch by batch; otherwise the CSV is
+    read in chunks. The cache is never built here, since that would need the
+    whole table in memory.
+    
+    Parameters:
+    -----------
+    table_name : str
+        Name of the table to load (e.g., 'customers', 'orders')
+    chunksize : int, default=CSV_CHUNK_SIZE
+        Maximum number of rows per chunk
+    columns : list of str, optional
+        Columns to load (default: all columns)
+    filters : list of tuple, optional
+        Row filters as (column, op, value) tuples, as in `load_olist_data`
+    use_cache : bool, default=True
+        Whether to read from an existing Parquet cache
+    
+    Yields:
+    -------
+    pandas.DataFrame
+        The next chunk of the table (chunks may be empty after filtering)
+    """
+    import os
+    import pandas as pd
     
-    filename = table_map[table_name]
+    csv_path = _table_path(table_name)
     
     try:
-        # First try to load from the Data folder
-        return pd.read_csv(f'Data/{filename}')
+        cache_path = _cache_path(csv_path)
     except FileNotFoundError:
-        # If not available, raise an error with instructions
-        raise FileNotFoundError(f"The file {filename} was not found in the Data folder. "
-                              f"Please ensure the file exists in the correct location.")
+        raise _missing_file_error(table_name)
+    
+    filters = _normalize_filters(table_name, filters)
+    
+    read_columns = None
+    if columns is not None:
+        filter_columns = [column for column, _, _ in filters or []]
+        read_columns = list(dict.fromkeys(list(columns) + filter_columns))
+    
+    if use_cache and _has_parquet_engine() and os.path.exists(cache_path):
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(cache_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=read_columns):
+            yield _select(batch.to_pandas(), columns, filters)
+    else:
+        schema = TABLE_SCHEMAS[table_name]
+        header = pd.read_csv(csv_path, nrows=0).columns
+        parse_dates = [
+            col for col in schema['parse_dates']
+            if col in header and (read_columns is None or col in read_columns)
+        ]
+        reader = pd.read_csv(csv_path, dtype=schema['dtype'], parse_dates=parse_dates,
+                             usecols=read_columns, chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                yield _select(chunk, columns, filters)
 
-def join_order_data():
+def stream_aggregate(table_name, aggregations, by=None, chunksize=CSV_CHUNK_SIZE, filters=None,
+                     use_cache=True):
+    """
+    Compute aggregations over a table chunk by chunk, with bounded memory
+    
+    Each chunk is reduced to partial results (counts, sums, minimums and
+    maximums per group), and the partials are combined at the end, so only
+    one chunk plus the per-group partials are held in memory.
+    
+    Parameters:
+    -----------
+    table_name : str
+        Name of the table to aggregate (e.g., 'orders', 'order_payments')
+    aggregations : dict
+        Column name -> list of functions ('count', 'sum', 'mean', 'min', 'max')
+    by : str or list of str, optional
+        Column(s) to group by (e.g., 'order_status'); None aggregates the whole table
+    chunksize : int, default=CSV_CHUNK_SIZE
+        Maximum number of rows per chunk
+    filters : list of tuple, optional
+        Row filters as (column, op, value) tuples, as in `load_olist_data`
+    use_cache : bool, default=True
+        Whether to read from an existing Parquet cache
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One column per aggregation named '<column>_<function>', with one row
+        per group (or a single row when `by` is None). The result matches
+        df.groupby(by).agg(...) on the fully loaded table. When `by` is None
+        and no rows match the filters, the row holds counts of 0 and NaN for
+        the other aggregates.
+    """
+    import pandas as pd
+    
+    valid_funcs = ['count', 'sum', 'mean', 'min', 'max']
+    for column, funcs in aggregations.items():
+        for func in funcs:
+            if func not in valid_funcs:
+                raise ValueError(f"Unsupported aggregation function: {func}. "
+                                 f"Valid options are: {valid_funcs}")
+    
+    keys = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    
+    # Partial results that can be merged across chunks
+    # (a mean is rebuilt from its sum and count at the end)
+    partial_funcs = {}
+    for column, funcs in aggregations.items():
+        needed = set(funcs) - {'mean'}
+        if 'mean' in funcs:
+            needed |= {'count', 'sum'}
+        partial_funcs[column] = sorted(needed)
+    combine = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+    
+    columns = list(dict.fromkeys(keys + list(aggregations)))
+    partials = []
+    for chunk in iter_olist_data(table_name, chunksize=chunksize, columns=columns,
+                                 filters=filters, use_cache=use_cache):
+        if keys:
+            grouped = chunk.groupby(keys, observed=True)
+        else:
+            grouped = chunk.groupby(lambda _: 0)
+        partials.append(grouped.agg(partial_funcs))
+    
+    # Merge the partial results of all chunks
+    stacked = pd.concat(partials)
+    level = list(range(stacked.index.nlevels))
+    combined = stacked.groupby(level=level).agg(
+        {(column, func): combine[func] for column, func in stacked.columns}
+    )
+    
+    result = pd.DataFrame(index=combined.index)
+    for column, funcs in aggregations.items():
+        for func in funcs:
+            if func == 'mean':
+                result[f'{column}_mean'] = combined[(column, 'sum')] / combined[(column, 'count')]
+            else:
+                result[f'{column}_{func}'] = combined[(column, func)]
+    
+    if keys:
+        result.index.names = keys
+    else:
+        # Keep the single row when the filters match nothing: a count of 0
+        # and NaN for every other aggregate
+        result = result.reset_index(drop=True).reindex([0])
+        counts = [f'{column}_count' for column, funcs in aggregations.items() if 'count' in funcs]
+        result[counts] = result[counts].fillna(0).astype('int64')
+    
+    return result
+
+def stream_value_counts(table_name, column, chunksize=CSV_CHUNK_SIZE, filters=None, use_cache=True):
+    """
+    Count rows per value of a column (like value_counts) chunk by chunk
+    
+    Parameters:
+    -----------
+    table_name : str
+        Name of the table (e.g., 'orders', 'customers')
+    column : str
+        Column to count (e.g., 'order_status', 'customer_state')
+    chunksize : int, default=CSV_CHUNK_SIZE
+        Maximum number of rows per chunk
+    filters : list of tuple, optional
+        Row filters as (column, op, value) tuples, as in `load_olist_data`
+    use_cache : bool, default=True
+        Whether to read from an existing Parquet cache
+    
+    Returns:
+    --------
+    pandas.Series
+        Row count per value, largest first
+    """
+    import pandas as pd
+    
+    counts = pd.Series(dtype='int64')
+    for chunk in iter_olist_data(table_name, chunksize=chunksize, columns=[column],
+                                 filters=filters, use_cache=use_cache):
+        chunk_counts = chunk[column].astype(object).value_counts()
+        counts = counts.add(chunk_counts, fill_value=0)
+    
+    counts = counts.astype('int64').sort_values(ascending=False, kind='stable')
+    counts.index.name = column
+    counts.name = 'count'
+    return counts
+
+def benchmark_cache(tables=None, repeat=3):
+    """
+    Compare CSV load time with Parquet cache load time for each table
+    
+    Parameters:
+    -----------
+    tables : list of str, optional
+        Tables to benchmark (default: every table found in the Data folder)
+    repeat : int, default=3
+        Number of timed loads per table; the best time is reported
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per table with the cold CSV time, warm cache time and speedup
+    """
+    import os
+    import time
+    import pandas as pd
+    
+    if tables is None:
+        tables = [name for name in TABLE_MAP if os.path.exists(_table_path(name))]
+    
+    results = []
+    for table_name in tables:
+        csv_times = []
+        cache_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            df = load_olist_data(table_name, use_cache=False)
+            csv_times.append(time.perf_counter() - start)
+        
+        # Make sure the cache exists before timing warm loads
+        load_olist_data(table_name)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load_olist_data(table_name)
+            cache_times.append(time.perf_counter() - start)
+        
+        results.append({
+            'table': table_name,
+            'rows': len(df),
+            'csv_seconds': min(csv_times),
+            'cache_seconds': min(cache_times),
+            'speedup': min(csv_times) / min(cache_times)
+        })
+    
+    return pd.DataFrame(results)
+
+def schema_memory_report(tables=None):
+    """
+    Compare memory use of each table with and without TABLE_SCHEMAS
+    
+    Parameters:
+    -----------
+    tables : list of str, optional
+        Tables to check (default: every table found in the Data folder)
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per table with memory_usage(deep=True) in MB for the plain
+        read_csv load, the typed load and the typed load with interned IDs
+    """
+    import os
+    import pandas as pd
+    
+    if tables is None:
+        tables = [name for name in TABLE_MAP if os.path.exists(_table_path(name))]
+    
+    def to_mb(df):
+        return df.memory_usage(deep=True).sum() / 1024**2
+    
+    results = []
+    for table_name in tables:
+        raw = pd.read_csv(_table_path(table_name))
+        typed = load_olist_data(table_name, use_cache=False)
+        interned = intern_ids(typed)
+        
+        results.append({
+            'table': table_name,
+            'rows': len(raw),
+            'default_mb': to_mb(raw),
+            'typed_mb': to_mb(typed),
+            'interned_mb': to_mb(interned),
+            'reduction': to_mb(raw) / to_mb(interned)
+        })
+    
+    return pd.DataFrame(results)
+
+def _tables_fingerprint(table_names, version):
+    """
+    Fingerprint of the source CSV files of a dataset derived from several tables
+    """
+    import os
+    
+    try:
+        return _fingerprint([_table_path(name) for name in table_names], version)
+    except FileNotFoundError:
+        for name in table_names:
+            if not os.path.exists(_table_path(name)):
+                raise _missing_file_error(name)
+        raise
+
+def _join_fingerprint():
+    """
+    Fingerprint of the three tables used by join_order_data
+    """
+    return _tables_fingerprint(['orders', 'customers', 'order_items'], f"join{JOIN_VERSION}")
+
+def join_order_data(use_cache=True):
     """
     Join the main order-related tables (orders, customers, order_items)
     and return a comprehensive order dataset
     
+    The joined result is saved in `Data/.cache` and reused until one of the
+    three source CSV files changes, so the two merges only run once.
+    
+    Parameters:
+    -----------
+    use_cache : bool, default=True
+        Whether to read from (and write to) the cached joined dataset
+    
     Returns:
     --------
     pandas.DataFrame
         Joined order data
     """
+    import os
+    import pandas as pd
+    
+    use_cache = use_cache and _has_parquet_engine()
+    
+    if use_cache:
+        cache_path = os.path.join(CACHE_DIR, f"joined_orders-{_join_fingerprint()}.parquet")
+        try:
+            return pd.read_parquet(cache_path)
+        except FileNotFoundError:
+            # Not built yet for this version of the data
+            pass
+        except (OSError, ValueError):
+            # Damaged or truncated: rebuild it below
+            _remove_cache(cache_path)
+    
     # Load required tables
-    orders = load_olist_data('orders')
-    customers = load_olist_data('customers')
-    order_items = load_olist_data('order_items')
+    orders = load_olist_data('orders', use_cache=use_cache)
+    customers = load_olist_data('customers', use_cache=use_cache)
+    order_items = load_olist_data('order_items', use_cache=use_cache)
     
     # Join the tables
     orders_with_customers = orders.merge(customers, on='customer_id', how='left')
     complete_orders = orders_with_customers.merge(order_items, on='order_id', how='left')
     
+    if use_cache:
+        try:
+            _write_cache(complete_orders, cache_path)
+        except OSError:
+            pass
+    
     return complete_orders
 
-def calculate_delivery_time(orders_df):
+def _key_codes(orders_df, column):
+    """
+    Factorise a join key column into int32 codes and sorted unique values
+    """
+    import pandas as pd
+    
+    codes, uniques = pd.factorize(orders_df[column], sort=True)
+    return codes.astype('int32'), pd.Index(uniques)
+
+def _join_index():
+    """
+    Return the joined order data and the _JOIN_INDEX dict holding its factorised
+    join keys and the row plan for each added table
+    
+    All of these are kept until one of the source CSV files changes, so
+    repeated calls neither re-read the joined data nor re-hash its keys.
+    """
+    fingerprint = _join_fingerprint()
+    if _JOIN_INDEX.get('fingerprint') != fingerprint:
+        _JOIN_INDEX.clear()
+        _JOIN_INDEX['fingerprint'] = fingerprint
+        _JOIN_INDEX['frame'] = join_order_data()
+        _JOIN_INDEX['keys'] = {}
+        _JOIN_INDEX['plans'] = {}
+    return _JOIN_INDEX['frame'], _JOIN_INDEX
+
+def extend_order_data(table_name, orders_df=None, columns=None):
+    """
+    Add the columns of another table to the joined order data
+    
+    Works like orders_df.merge(table, on=key, how='left'). When `orders_df`
+    is not given, the joined data, its key column (factorised into int32
+    codes) and the matching row positions are kept in memory, so later calls
+    skip hashing the 32-character keys altogether and just gather rows.
+    
+    Parameters:
+    -----------
+    table_name : str
+        Table to add: 'products', 'sellers', 'order_payments' or 'order_reviews'
+    orders_df : pandas.DataFrame, optional
+        Joined order data (default: the cached result of `join_order_data`)
+    columns : list of str, optional
+        Columns of the added table to keep (default: all columns)
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Joined order data with the extra columns (a column name that is
+        already present gets a '_<table_name>' suffix)
+    """
+    import pandas as pd
+    
+    if table_name not in JOIN_KEYS:
+        raise ValueError(f"Invalid table name. Valid options are: {list(JOIN_KEYS.keys())}")
+    
+    key = JOIN_KEYS[table_name]
+    
+    if columns is not None:
+        columns = [key] + [col for col in columns if col != key]
+    right = load_olist_data(table_name, columns=columns)
+    
+    if orders_df is None:
+        orders_df, join_index = _join_index()
+        
+        # Reuse the row plan while neither side has changed
+        table_fingerprint = _fingerprint([_table_path(table_name)])
+        plan = join_index['plans'].get(table_name)
+        if plan is None or plan[0] != table_fingerprint:
+            if key not in join_index['keys']:
+                join_index['keys'][key] = _key_codes(orders_df, key)
+            left_codes, uniques = join_index['keys'][key]
+            plan = (table_fingerprint,) + _join_plan(left_codes, uniques, right[key])
+            join_index['plans'][table_name] = plan
+        left_rows, right_take = plan[1], plan[2]
+    else:
+        left_codes, uniques = _key_codes(orders_df, key)
+        left_rows, right_take = _join_plan(left_codes, uniques, right[key])
+    
+    # Row -1 is missing from the RangeIndex, so reindex fills unmatched rows with NaN
+    added = right.drop(columns=key).reset_index(drop=True).reindex(right_take)
+    added.columns = [col if col not in orders_df.columns else f"{col}_{table_name}"
+                     for col in added.columns]
+    added.index = range(len(added))
+    
+    result = orders_df.take(left_rows).reset_index(drop=True)
+    return pd.concat([result, added], axis=1)
+
+def _join_plan(left_codes, uniques, right_keys):
+    """
+    Work out which left and right rows make up a left join on factorised keys
+    
+    Returns two arrays of equal length: the order data row and the added
+    table row (-1 when there is no match) of each row of the result.
+    """
+    import numpy as np
+    
+    # Keys of the added table that never occur in the order data get -1 and are dropped
+    right_codes = uniques.get_indexer(right_keys)
+    right_rows = np.flatnonzero(right_codes >= 0)
+    right_codes = right_codes[right_rows]
+    
+    # Group the added table's rows by code (stable, so each key keeps file order)
+    order = right_rows[np.argsort(right_codes, kind='stable')]
+    counts = np.bincount(right_codes, minlength=len(uniques))
+    starts = np.cumsum(counts) - counts
+    
+    # Each order row is repeated once per matching row (at least once, as in a left join)
+    has_key = left_codes >= 0
+    matches = np.where(has_key, counts[np.where(has_key, left_codes, 0)], 0)
+    repeats = np.maximum(matches, 1)
+    left_rows = np.repeat(np.arange(len(left_codes)), repeats)
+    
+    # Position of each output row within its key's group of matching rows
+    offsets = np.arange(len(left_rows)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    matched = np.repeat(matches > 0, repeats)
+    right_take = np.full(len(left_rows), -1, dtype='int64')
+    group_start = np.repeat(starts[np.where(has_key, left_codes, 0)], repeats)
+    right_take[matched] = order[group_start[matched] + offsets[matched]]
+    
+    return left_rows, right_take
+
+def benchmark_join(repeat=3):
+    """
+    Compare cold and warm timings of join_order_data and extend_order_data
+    
+    Parameters:
+    -----------
+    repeat : int, default=3
+        Number of timed runs per step; the best time is reported
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per step with the cold time, warm time and speedup. For
+        join_order_data, cold means both merges run from the loaded tables;
+        for extend_order_data, cold is a plain DataFrame.merge.
+    """
+    import os
+    import time
+    import pandas as pd
+    
+    def best_time(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+    
+    def cold_join():
+        orders = load_olist_data('orders')
+        customers = load_olist_data('customers')
+        order_items = load_olist_data('order_items')
+        return orders.merge(customers, on='customer_id', how='left').merge(
+            order_items, on='order_id', how='left')
+    
+    # Build the cached join before timing warm runs
+    joined = join_order_data()
+    results = [{
+        'step': 'join_order_data',
+        'cold_seconds': best_time(cold_join),
+        'warm_seconds': best_time(join_order_data)
+    }]
+    
+    for table_name, key in JOIN_KEYS.items():
+        if not os.path.exists(_table_path(table_name)):
+            continue
+        extend_order_data(table_name)
+        results.append({
+            'step': f"extend_order_data('{table_name}')",
+            'cold_seconds': best_time(
+                lambda: joined.merge(load_olist_data(table_name), on=key, how='left')),
+            'warm_seconds': best_time(lambda: extend_order_data(table_name))
+        })
+    
+    results = pd.DataFrame(results)
+    results['speedup'] = results['cold_seconds'] / results['warm_seconds']
+    return results
+
+def _estimate_rows(table_name):
+    """
+    Estimate the number of rows in a table without loading it
+    
+    Uses the Parquet cache metadata when available, otherwise divides the
+    CSV file size by the average size of its first lines.
+    """
+    import os
+    
+    csv_path = _table_path(table_name)
+    try:
+        cache_path = _cache_path(csv_path)
+    except FileNotFoundError:
+        raise _missing_file_error(table_name)
+    
+    if _has_parquet_engine() and os.path.exists(cache_path):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(cache_path).metadata.num_rows
+    
+    with open(csv_path, 'rb') as f:
+        f.readline()  # header
+        sample = [len(line) for _, line in zip(range(1000), f)]
+    if not sample:
+        return 0
+    return int(os.path.getsize(csv_path) / (sum(sample) / len(sample)))
+
+def plan_join(tables, grain='item'):
+    """
+    Work out how to join a set of Olist tables
+    
+    The tables are joined along JOIN_TREE, starting from the smallest part of
+    the tree that connects them (tables needed only to link others, such as
+    'orders' between 'order_reviews' and 'customers', are added with just their
+    key columns). Below each table, 'lookup' joins run before 'fanout' joins,
+    and each group runs smallest table first, so intermediate frames stay as
+    small as possible. Item-level lookups (products, sellers, categories) are
+    joined onto order_items before order_items meets the orders.
+    
+    Parameters:
+    -----------
+    tables : list of str
+        Tables needed (e.g., ['orders', 'order_reviews', 'customers'])
+    grain : {'item', 'order'}, default='item'
+        'item' keeps one row per item/payment/review, like a plain merge.
+        'order' reduces order_items, order_payments and order_reviews to one
+        row per order before joining, which avoids the row fan-out: only the
+        aggregates in ORDER_LEVEL_AGGREGATIONS (e.g. 'price_sum') are kept.
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per join in execution order, with the left and right table,
+        join key, kind, estimated right table rows and whether the right table
+        is aggregated to one row per order first
+    """
+    import pandas as pd
+    
+    tables = list(dict.fromkeys(tables))
+    for table_name in tables:
+        if table_name not in TABLE_MAP:
+            raise ValueError(f"Invalid table name. Valid options are: {list(TABLE_MAP.keys())}")
+    
+    parents = {}
+    for parent, children in JOIN_TREE.items():
+        for child, key, kind in children:
+            parents[child] = (parent, key, kind)
+    
+    def path_from_root(table_name):
+        path = [table_name]
+        while path[0] in parents:
+            path.insert(0, parents[path[0]][0])
+        return path
+    
+    # The top of the join is the deepest table shared by all paths from the root
+    paths = [path_from_root(table_name) for table_name in tables]
+    top_depth = 0
+    while all(len(path) > top_depth + 1 for path in paths) and \
+            len({path[top_depth + 1] for path in paths}) == 1:
+        top_depth += 1
+    top = paths[0][top_depth]
+    needed = {table_name for path in paths for table_name in path[top_depth:]}
+    
+    item_tables = {'products', 'sellers', 'categories'}
+    if grain not in ('order', 'item'):
+        raise ValueError(f"Invalid grain '{grain}'. Valid options are: ['order', 'item']")
+    if grain == 'order' and top == 'orders' and needed & item_tables:
+        raise ValueError("Item-level tables (products, sellers, categories) cannot be joined "
+                         "at order grain; use grain='item'")
+    
+    estimates = {table_name: _estimate_rows(table_name) for table_name in needed}
+    
+    steps = []
+    def add_steps(table_name):
+        children = [child for child in JOIN_TREE.get(table_name, []) if child[0] in needed]
+        children.sort(key=lambda child: (child[2] != 'lookup', estimates[child[0]]))
+        for child, _, _ in children:
+            add_steps(child)
+        for child, key, kind in children:
+            steps.append({
+                'left': table_name,
+                'right': child,
+                'key': key,
+                'kind': kind,
+                'right_rows': estimates[child],
+                'aggregate': grain == 'order' and table_name == 'orders' and kind == 'fanout'
+            })
+    add_steps(top)
+    
+    plan = pd.DataFrame(steps, columns=['left', 'right', 'key', 'kind', 'right_rows', 'aggregate'])
+    plan.attrs['top'] = top
+    plan.attrs['grain'] = grain
+    return plan
+
+def _aggregate_per_order(table_name, df):
+    """
+    Reduce a 'fanout' table to one row per order using ORDER_LEVEL_AGGREGATIONS
+    
+    Only the aggregates whose source column was loaded are computed; the
+    other columns are dropped.
+    """
+    spec = {
+        name: (column, func)
+        for name, (column, func) in ORDER_LEVEL_AGGREGATIONS.get(table_name, {}).items()
+        if column in df.columns
+    }
+    if not spec:
+        return df[['order_id']].drop_duplicates(ignore_index=True)
+    
+    return df.groupby('order_id', sort=False, observed=True).agg(**spec).reset_index()
+
+def join_olist_tables(tables, columns=None, filters=None, grain='item'):
+    """
+    Load and join any combination of Olist tables
+    
+    The join order comes from `plan_join`. Only the requested columns (plus
+    the keys needed to join) are loaded, and filters are pushed down into
+    each table's reader. Joins are left joins from the top table, like
+    `join_order_data`, except on the path to a filtered table: those are
+    inner joins, so the result matches filtering after the join (rows with
+    no match in a filtered table are dropped). At order grain, a filter on
+    a 'fanout' table keeps the orders with at least one matching row and
+    aggregates only the matching rows.
+    
+    Parameters:
+    -----------
+    tables : list of str
+        Tables needed (e.g., ['orders', 'order_reviews', 'customers'])
+    columns : dict, optional
+        Table name -> list of columns to keep from that table
+        (default: all columns of every table)
+    filters : dict, optional
+        Table name -> list of (column, op, value) filters, as in `load_olist_data`
+    grain : {'item', 'order'}, default='item'
+        Row grain of the result, see `plan_join`
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Joined data
+    
+    Examples:
+    ---------
+    >>> join_olist_tables(
+    ...     ['orders', 'order_reviews', 'customers'],
+    ...     columns={'orders': ['order_purchase_timestamp'],
+    ...              'order_reviews': ['review_score'],
+    ...              'customers': ['customer_state']},
+    ...     filters={'orders': [('order_purchase_timestamp', '>=', '2018-06-01')]})
+    
+    One row per order, with the mean review score in 'review_score_mean':
+    
+    >>> join_olist_tables(['orders', 'order_reviews'], grain='order',
+    ...                   columns={'order_reviews': ['review_score']})
+    """
+    columns = columns or {}
+    filters = filters or {}
+    plan = plan_join(tables, grain=grain)
+    top = plan.attrs['top']
+    
+    # Each table also needs the keys that link it to its neighbours in the plan
+    keys = {top: set()}
+    for step in plan.itertuples():
+        keys.setdefault(step.left, set()).add(step.key)
+        keys.setdefault(step.right, set()).add(step.key)
+    
+    def load(table_name):
+        table_columns = columns.get(table_name)
+        if table_columns is None and table_name not in tables:
+            # Only used to link other tables, so only its keys are needed
+            table_columns = []
+        if table_columns is not None:
+            table_columns = list(dict.fromkeys(sorted(keys[table_name]) + list(table_columns)))
+        return load_olist_data(table_name, columns=table_columns, filters=filters.get(table_name))
+    
+    # Tables that are filtered, or that link a filtered table to the top
+    parents = {step.right: step.left for step in plan.itertuples()}
+    restricted = set()
+    for table_name in filters:
+        if not filters[table_name]:
+            continue
+        while table_name in parents:
+            restricted.add(table_name)
+            table_name = parents[table_name]
+    
+    frames = {}
+    for step in plan.itertuples():
+        if step.left not in frames:
+            frames[step.left] = load(step.left)
+        right = frames.pop(step.right) if step.right in frames else load(step.right)
+        if step.aggregate:
+            right = _aggregate_per_order(step.right, right)
+        how = 'inner' if step.right in restricted else 'left'
+        frames[step.left] = frames[step.left].merge(right, on=step.key, how=how)
+    
+    return frames[top] if top in frames else load(top)
+
+def _days_between(end, start):
+    """
+    Difference in days between two datetime Series, using int64 arithmetic
+    
+    The int64 values are taken in the Series' own time unit (e.g. ns or us),
+    so no converted copy of the timestamps is made. Missing timestamps (NaT)
+    give NaN.
+    """
+    import numpy as np
+    
+    end = end.to_numpy()
+    if not np.issubdtype(end.dtype, np.datetime64):
+        # e.g. timezone-aware columns, which to_numpy returns as objects
+        end = end.astype('datetime64[ns]')
+    start = start.to_numpy().astype(end.dtype, copy=False)
+    
+    unit = np.datetime_data(end.dtype)[0]
+    units_per_day = np.timedelta64(1, 'D') // np.timedelta64(1, unit)
+    
+    days = (end.view('int64') - start.view('int64')) / units_per_day
+    days[np.isnat(end) | np.isnat(start)] = np.nan
+    return days
+
+def calculate_delivery_time(orders_df, inplace=False, columns_only=False):
     """
     Calculate delivery time metrics for orders
     
+    Timestamp columns that are already datetime64 (as returned by
+    `load_olist_data`) are used as they are; text columns are parsed with
+    the fixed ISO 8601 format instead of guessing the format.
+    
     Parameters:
     -----------
     orders_df : pandas.DataFrame
         DataFrame containing the orders data
+    inplace : bool, default=False
+        Add the columns to `orders_df` itself instead of to a copy
+        (text timestamp columns are also replaced by parsed ones)
+    columns_only : bool, default=False
+        Return only the new columns (with the same index as `orders_df`),
+        without copying the rest of the frame
     
     Returns:
     --------
     pandas.DataFrame
-        Orders DataFrame with added delivery time columns
+        Orders DataFrame with added delivery time columns (or just the
+        delivery time columns when `columns_only` is True)
     """
     import pandas as pd
     
-    # Create a copy to avoid modifying the original
-    df = orders_df.copy()
-    
-    # Convert date columns to datetime
-    date_columns = [
-        'order_purchase_timestamp',
-        'order_approved_at',
-        'order_delivered_carrier_date',
-        'order_delivered_customer_date',
-        'order_estimated_delivery_date'
-    ]
-    
-    for col in date_columns:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col])
+    # Convert date columns to datetime (only if they are not parsed already)
+    dates = {}
+    for col in TABLE_SCHEMAS['orders']['parse_dates']:
+        if col in orders_df.columns:
+            values = orders_df[col]
+            if not pd.api.types.is_datetime64_any_dtype(values):
+                values = pd.to_datetime(values, format=DATE_FORMAT)
+            dates[col] = values
     
     # Calculate delivery times
-    if 'order_purchase_timestamp' in df.columns and 'order_delivered_customer_date' in df.columns:
-        df['delivery_time_days'] = (df['order_delivered_customer_date'] - 
-                                  df['order_purchase_timestamp']).dt.total_seconds() / (60*60*24)
+    new_columns = {}
+    if 'order_purchase_timestamp' in dates and 'order_delivered_customer_date' in dates:
+        new_columns['delivery_time_days'] = _days_between(dates['order_delivered_customer_date'],
+                                                          dates['order_purchase_timestamp'])
     
-    if 'order_delivered_customer_date' in df.columns and 'order_estimated_delivery_date' in df.columns:
-        df['delivery_vs_estimate_days'] = (df['order_delivered_customer_date'] - 
-                                        df['order_estimated_delivery_date']).dt.total_seconds() / (60*60*24)
+    if 'order_delivered_customer_date' in dates and 'order_estimated_delivery_date' in dates:
+        new_columns['delivery_vs_estimate_days'] = _days_between(dates['order_delivered_customer_date'],
+                                                                 dates['order_estimated_delivery_date'])
         
         # Add a flag for late deliveries
+        new_columns['is_late_delivery'] = new_columns['delivery_vs_estimate_days'] > 0
+    
+    if columns_only:
+        return pd.DataFrame(new_columns, index=orders_df.index)
+    
+    # Create a copy to avoid modifying the original (unless asked to)
+    df = orders_df if inplace else orders_df.copy()
+    for col, values in dates.items():
+        if values is not orders_df[col]:
+            df[col] = values
+    for col, values in new_columns.items():
+        df[col] = values
+    
+    return df
+
+def benchmark_delivery_time(n_rows=1000000, repeat=3, seed=0):
+    """
+    Compare calculate_delivery_time modes on a synthetic orders table
+    
+    'original' copies the frame, parses with format guessing and uses
+    .dt.total_seconds() (the previous implementation); the other rows use
+    the current implementation on text timestamps and on timestamps that
+    are already parsed.
+    
+    Parameters:
+    -----------
+    n_rows : int, default=1000000
+        Number of synthetic orders
+    repeat : int, default=3
+        Number of timed runs per mode; the best time is reported
+    seed : int, default=0
+        Random seed for the synthetic data
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per mode with the best time in seconds and the peak memory
+        allocated during a run in MB
+    """
+    import time
+    import tracemalloc
+    import numpy as np
+    import pandas as pd
+    
+    rng = np.random.default_rng(seed)
+    purchase = pd.Timestamp('2017-01-01') + pd.to_timedelta(
+        rng.integers(0, 600 * 86400, n_rows), unit='s')
+    parsed = pd.DataFrame({
+        'order_id': np.arange(n_rows),
+        'order_purchase_timestamp': purchase,
+        'order_delivered_customer_date': purchase + pd.to_timedelta(
+            rng.integers(1 * 86400, 40 * 86400, n_rows), unit='s'),
+        'order_estimated_delivery_date': (purchase + pd.to_timedelta(
+            rng.integers(10, 30, n_rows), unit='D')).normalize()
+    })
+    text = parsed.copy()
+    for col in parsed.columns[1:]:
+        text[col] = parsed[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+    
+    def original(orders_df):
+        df = orders_df.copy()
+        for col in parsed.columns[1:]:
+            df[col] = pd.to_datetime(df[col])
+        df['delivery_time_days'] = (df['order_delivered_customer_date'] -
+                                    df['order_purchase_timestamp']).dt.total_seconds() / (60*60*24)
+        df['delivery_vs_estimate_days'] = (df['order_delivered_customer_date'] -
+                                           df['order_estimated_delivery_date']).dt.total_seconds() / (60*60*24)
         df['is_late_delivery'] = df['delivery_vs_estimate_days'] > 0
+        return df
+    
+    modes = [
+        ('original (text)', lambda: original(text)),
+        ('copy (text)', lambda: calculate_delivery_time(text)),
+        ('original (parsed)', lambda: original(parsed)),
+        ('copy (parsed)', lambda: calculate_delivery_time(parsed)),
+        ('inplace (parsed)', lambda: calculate_delivery_time(parsed.copy(deep=False), inplace=True)),
+        ('columns_only (parsed)', lambda: calculate_delivery_time(parsed, columns_only=True))
+    ]
+    
+    results = []
+    for name, func in modes:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        results.append({'mode': name, 'seconds': min(times), 'peak_mb': peak / 1024**2})
+    
+    return pd.DataFrame(results)
+
+def prepare_satisfaction_data(orders, reviews, customers):
+    """
+    Build the customer satisfaction dataset: one row per review with the
+    order's delivery times and the customer's location
+    
+    Rows without a review score or a delivery date, with a negative delivery
+    time or with more than MAX_DELIVERY_DAYS are dropped.
+    
+    Parameters:
+    -----------
+    orders : pandas.DataFrame
+        Orders table
+    reviews : pandas.DataFrame
+        Order reviews table
+    customers : pandas.DataFrame
+        Customers table
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Prepared dataset with actual_delivery_days, estimated_delivery_days,
+        delivery_delay and is_late columns
+    """
+    import pandas as pd
+    
+    merged = orders.merge(reviews, on='order_id', how='inner')
+    merged = merged.merge(customers, on='customer_id', how='left')
+    
+    # No-ops when the tables were loaded with their schema
+    for col in ['order_purchase_timestamp', 'order_delivered_customer_date', 'order_estimated_delivery_date']:
+        merged[col] = pd.to_datetime(merged[col])
+    
+    purchase = merged['order_purchase_timestamp']
+    merged['actual_delivery_days'] = (merged['order_delivered_customer_date'] - purchase).dt.days
+    merged['estimated_delivery_days'] = (merged['order_estimated_delivery_date'] - purchase).dt.days
+    merged['delivery_delay'] = merged['actual_delivery_days'] - merged['estimated_delivery_days']
+    merged['is_late'] = merged['delivery_delay'] > 0
+    
+    # between() is False for missing delivery times
+    keep = merged['review_score'].notna() & merged['actual_delivery_days'].between(0, MAX_DELIVERY_DAYS)
+    return merged[keep].reset_index(drop=True)
+
+def _satisfaction_path():
+    """
+    Path of the prepared satisfaction dataset for the current source files
+    """
+    import os
+    
+    digest = _tables_fingerprint(SATISFACTION_TABLES, f"satisfaction{SATISFACTION_VERSION}")
+    return os.path.join(CACHE_DIR, f"satisfaction-{digest}.arrow")
+
+def build_satisfaction_data(force=False):
+    """
+    Build the prepared satisfaction dataset and save it in `Data/.cache`
+    
+    Meant to be run once as an offline step (e.g. before starting the app)
+    so app processes only have to memory-map the result, see
+    load_satisfaction_data. The file is an uncompressed Arrow (Feather)
+    file whose name includes a fingerprint of the source CSV files and
+    SATISFACTION_VERSION, so it is rebuilt when either changes.
+    
+    Parameters:
+    -----------
+    force : bool, default=False
+        Rebuild even if the file for the current source files exists
+    
+    Returns:
+    --------
+    str
+        Path of the prepared dataset
+    """
+    import glob
+    import os
+    
+    if not _has_parquet_engine():
+        raise ImportError("pyarrow is required to build the prepared satisfaction dataset")
+    
+    path = _satisfaction_path()
+    if os.path.exists(path) and not force:
+        return path
+    
+    tables = load_olist_tables(SATISFACTION_TABLES)
+    prepared = prepare_satisfaction_data(tables['orders'], tables['order_reviews'], tables['customers'])
+    
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for old_path in glob.glob(os.path.join(CACHE_DIR, 'satisfaction-*.arrow')):
+        if old_path != path:
+            os.remove(old_path)
+    
+    # Uncompressed so the file can be memory-mapped; written to a temporary
+    # file first so readers never see a half-written dataset
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    prepared.to_feather(tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    return path
+
+def load_satisfaction_data(build=True):
+    """
+    Load the prepared satisfaction dataset by memory-mapping its Arrow file
+    
+    Columns that need no conversion (numbers and timestamps without missing
+    values, strings) point straight into the mapped file, so several
+    processes loading the same file share those pages through the OS page
+    cache instead of each holding a private copy.
+    
+    Parameters:
+    -----------
+    build : bool, default=True
+        Build the dataset if it does not exist yet; otherwise raise
+        FileNotFoundError
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Prepared satisfaction dataset (see prepare_satisfaction_data)
+    """
+    import os
+    import pyarrow as pa
+    
+    path = _satisfaction_path()
+    if not os.path.exists(path):
+        if not build:
+            raise FileNotFoundError(f"{path} was not found. Run build_satisfaction_data() first.")
+        path = build_satisfaction_data()
+    
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.to_pandas(split_blocks=True)
+
+def filter_satisfaction_data(data, date_range=None, states=None, score_range=None):
+    """
+    Filter the prepared satisfaction dataset in one pass
+    
+    The filters are combined into a single boolean mask, built from the raw
+    int64 purchase timestamps, the customer_state category codes and the
+    review scores, and the rows are gathered once. Nothing is copied when
+    every row passes.
+    
+    Parameters:
+    -----------
+    data : pandas.DataFrame
+        Prepared satisfaction dataset (see prepare_satisfaction_data)
+    date_range : tuple of dates, optional
+        (start, end) purchase dates, both inclusive
+    states : list, optional
+        Customer states to keep (default: all)
+    score_range : tuple of int, optional
+        (min, max) review scores, both inclusive
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Rows passing every filter. May be `data` itself, so do not modify it.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    mask = np.ones(len(data), dtype=bool)
+    
+    if date_range is not None and len(date_range) == 2:
+        # Whole days: start at midnight up to (not including) the day after end.
+        # NaT is the smallest int64, so it never passes.
+        timestamps = data['order_purchase_timestamp'].to_numpy()
+        unit = f"M8[{np.datetime_data(timestamps.dtype)[0]}]"
+        start = np.datetime64(date_range[0], 'D').astype(unit).view(np.int64)
+        stop = (np.datetime64(date_range[1], 'D') + 1).astype(unit).view(np.int64)
+        stamps = timestamps.view(np.int64)
+        mask &= stamps >= start
+        mask &= stamps < stop
+    
+    if states:
+        state = data['customer_state']
+        if not isinstance(state.dtype, pd.CategoricalDtype):
+            state = state.astype('category')
+        # One lookup per row into a table indexed by category code;
+        # the extra last entry is for code -1 (missing state)
+        allowed = np.zeros(len(state.cat.categories) + 1, dtype=bool)
+        indexer = state.cat.categories.get_indexer(list(states))
+        allowed[indexer[indexer >= 0]] = True
+        mask &= allowed[state.cat.codes.to_numpy()]
+    
+    if score_range is not None:
+        scores = data['review_score'].to_numpy()
+        mask &= scores >= score_range[0]
+        mask &= scores <= score_range[1]
+    
+    if mask.all():
+        return data
+    return data[mask]
+
+def _filter_satisfaction_copies(data, date_range, states, score_range):
+    """
+    Previous perform_analysis filtering: a full copy, then one boolean-index
+    copy per filter using .dt.date (kept for benchmark_satisfaction_filter)
+    """
+    filtered_data = data.copy()
+    start_date, end_date = date_range
+    filtered_data = filtered_data[
+        (filtered_data['order_purchase_timestamp'].dt.date >= start_date) &
+        (filtered_data['order_purchase_timestamp'].dt.date <= end_date)
+    ]
+    if states:
+        filtered_data = filtered_data[filtered_data['customer_state'].isin(states)]
+    filtered_data = filtered_data[
+        (filtered_data['review_score'] >= score_range[0]) &
+        (filtered_data['review_score'] <= score_range[1])
+    ]
+    return filtered_data
+
+def benchmark_satisfaction_filter(n_rows=10000000, repeat=3, seed=0, include_copies=True):
+    """
+    Time one dashboard interaction (date, state and score filters) on a
+    synthetic satisfaction dataset
+    
+    Parameters:
+    -----------
+    n_rows : int, default=10000000
+        Number of synthetic reviews
+    repeat : int, default=3
+        Number of timed runs per case; the best time is reported
+    seed : int, default=0
+        Random seed for the synthetic data
+    include_copies : bool, default=True
+        Also time the previous copy-per-filter implementation
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per filter setting and method with the rows kept and the
+        best time in seconds
+    """
+    import datetime
+    import time
+    import numpy as np
+    import pandas as pd
+    
+    rng = np.random.default_rng(seed)
+    states = ['SP', 'RJ', 'MG', 'RS', 'PR', 'SC', 'BA', 'DF', 'GO', 'ES', 'PE', 'CE', 'PA', 'MT']
+    purchase = pd.Timestamp('2017-01-01') + pd.to_timedelta(rng.integers(0, 600 * 86400, n_rows), unit='s')
+    data = pd.DataFrame({
+        'order_purchase_timestamp': purchase,
+        'customer_state': pd.Categorical.from_codes(rng.integers(0, len(states), n_rows), states),
+        'review_score': rng.integers(1, 6, n_rows).astype('int8'),
+        'actual_delivery_days': rng.integers(0, 60, n_rows).astype('float64'),
+        'is_late': rng.random(n_rows) < 0.1
+    })
+    
+    settings = [
+        ('everything', (datetime.date(2017, 1, 1), datetime.date(2018, 9, 1)), [], (1, 5)),
+        ('5 states', (datetime.date(2017, 1, 1), datetime.date(2018, 9, 1)), states[:5], (1, 5)),
+        ('3 months, 2 states, scores 1-2', (datetime.date(2017, 6, 1), datetime.date(2017, 8, 31)),
+         states[:2], (1, 2))
+    ]
+    methods = [('single mask', filter_satisfaction_data)]
+    if include_copies:
+        methods.append(('copy per filter', _filter_satisfaction_copies))
     
-    return df
\ No newline at end of file
+    results = []
+    for setting, date_range, selected, score_range in settings:
+        for name, method in methods:
+            best, kept = float('inf'), 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                kept = len(method(data, date_range, selected, score_range))
+                best = min(best, time.perf_counter() - start)
+            results.append({
+                'filters': setting,
+                'method': name,
+                'rows': n_rows,
+                'rows_kept': kept,
+                'seconds': best
+            })
+    return pd.DataFrame(results)
@@ -0,0 +1,294 @@
+# Streamlit Helper Functions
+# This file contains helper functions for the Streamlit apps, such as a
+# paginated table that only sends the visible page to the browser.
+#
+# st.dataframe serialises every row it is given (as Arrow) and ships it to
+# the browser, so a 1M-row result costs 1M rows of payload on every rerun.
+# paginated_dataframe searches and sorts the cached frame on the server and
+# hands st.dataframe a single page instead.
+
+# Rows shown per page by paginated_dataframe
+PAGE_SIZE = 50
+
+def _search_positions(df, search, search_columns):
+    """
+    Positions of the rows where any search column contains `search`
+    (case-insensitive, plain text). Returns None when there is no search.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if not search or not search_columns:
+        return None
+    
+    mask = np.zeros(len(df), dtype=bool)
+    for column in search_columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Search the categories once, then look the result up by code
+            matches = values.cat.categories.astype(str).str.contains(search, case=False, regex=False)
+            codes = values.cat.codes.to_numpy()
+            mask |= np.append(np.asarray(matches, dtype=bool), False)[codes]
+        else:
+            matches = values.astype('string').str.contains(search, case=False, regex=False)
+            mask |= matches.fillna(False).to_numpy(dtype=bool)
+    return np.flatnonzero(mask)
+
+def _sort_keys(values, descending=False):
+    """
+    Numeric keys whose ascending order is the requested order of `values`,
+    with missing values last
+    """
+    import numpy as np
+    import pandas as pd
+    
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(values.dtype):
+        keys = values.fillna(False).to_numpy(dtype=np.int64)
+    elif pd.api.types.is_integer_dtype(values.dtype) and not missing.any():
+        keys = values.to_numpy(dtype=np.int64)
+    elif pd.api.types.is_datetime64_any_dtype(values.dtype) or pd.api.types.is_timedelta64_dtype(values.dtype):
+        keys = values.to_numpy().view(np.int64).copy()
+    elif pd.api.types.is_numeric_dtype(values.dtype):
+        keys = values.to_numpy(dtype=np.float64, copy=True, na_value=np.nan)
+    else:
+        # Strings and categories: rank by sorted unique value
+        keys, _ = pd.factorize(values, sort=True)
+    
+    if descending:
+        # ~x reverses the order of integers without overflowing
+        keys = -keys if keys.dtype.kind == 'f' else ~keys
+    if missing.any():
+        keys[missing] = np.inf if keys.dtype.kind == 'f' else np.iinfo(keys.dtype).max
+    return keys
+
+def _smallest_positions(keys, stop):
+    """
+    Positions of the `stop` smallest keys, in stable sorted order
+    
+    Uses a partition (linear time) instead of sorting every key, so
+    fetching an early page of a large frame stays cheap.
+    """
+    import numpy as np
+    
+    if stop >= len(keys):
+        return np.argsort(keys, kind='stable')
+    
+    kth = np.partition(keys, stop - 1)[stop - 1]
+    below = np.flatnonzero(keys < kth)
+    ties = np.flatnonzero(keys == kth)[:stop - len(below)]
+    chosen = np.concatenate([below, ties])
+    return chosen[np.argsort(keys[chosen], kind='stable')]
+
+def _page_rows(df, positions, sort_by, descending, start, stop):
+    """
+    Row positions of df shown on the page [start, stop) of the searched and
+    sorted frame
+    """
+    import numpy as np
+    
+    if sort_by is None:
+        return np.arange(start, stop) if positions is None else positions[start:stop]
+    
+    keys = _sort_keys(df[sort_by], descending)
+    if positions is not None:
+        keys = keys[positions]
+    order = _smallest_positions(keys, stop)[start:]
+    return order if positions is None else positions[order]
+
+def paginate(df, page=1, page_size=PAGE_SIZE, sort_by=None, descending=False,
+             search=None, search_columns=None):
+    """
+    Return one page of a DataFrame after searching and sorting it
+    
+    Only the rows of the page are copied; the frame itself is not sorted or
+    filtered as a whole.
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Full (usually cached) frame
+    page : int, default=1
+        Page number, starting at 1; clipped to the available pages
+    page_size : int, default=PAGE_SIZE
+        Rows per page
+    sort_by : str, optional
+        Column to sort by (default: keep the frame's order)
+    descending : bool, default=False
+        Sort in descending order; missing values always come last
+    search : str, optional
+        Text to look for (case-insensitive) in `search_columns`
+    search_columns : list, optional
+        Columns searched for `search`
+    
+    Returns:
+    --------
+    tuple
+        (page DataFrame, number of rows matching the search)
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    
+    positions = _search_positions(df, search, search_columns)
+    n_rows = len(df) if positions is None else len(positions)
+    n_pages = max(-(-n_rows // page_size), 1)
+    page = min(max(int(page), 1), n_pages)
+    
+    start, stop = (page - 1) * page_size, min(page * page_size, n_rows)
+    rows = _page_rows(df, positions, sort_by, descending, start, stop)
+    return df.iloc[rows], n_rows
+
+def payload_bytes(df):
+    """
+    Size in bytes of a DataFrame serialised as an Arrow stream, which is
+    how st.dataframe sends it to the browser
+    
+    Falls back to the in-memory size when pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return int(df.memory_usage(deep=True).sum())
+    
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+def _format_bytes(n_bytes):
+    for unit in ['B', 'KB', 'MB']:
+        if n_bytes < 1024:
+            return f"{n_bytes:,.0f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:,.1f} GB"
+
+def paginated_dataframe(df, key, page_size=PAGE_SIZE, search_columns=None, sortable=True,
+                        **dataframe_kwargs):
+    """
+    Show a DataFrame one page at a time with server-side search and sort
+    
+    Adds search, sort and page controls above the table and a caption with
+    the payload size of the page, then passes only the page to st.dataframe.
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Frame to show; pass the cached frame, it is never copied as a whole
+    key : str
+        Unique prefix for the widget keys of this table
+    page_size : int, default=PAGE_SIZE
+        Rows per page
+    search_columns : list, optional
+        Columns searched by the search box (no search box when omitted)
+    sortable : bool, default=True
+        Whether to show the sort controls
+    **dataframe_kwargs
+        Passed to st.dataframe (e.g. use_container_width=True)
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        The page that was shown
+    """
+    import streamlit as st
+    
+    search_col, sort_col, page_col = st.columns(3)
+    
+    search = None
+    if search_columns:
+        search = search_col.text_input(
+            "🔍 Search:", key=f'{key}_search',
+            placeholder=', '.join(str(column) for column in search_columns)
+        )
+    
+    sort_by, descending = None, False
+    if sortable:
+        sort_by = sort_col.selectbox(
+            "Sort by:", [None] + list(df.columns), key=f'{key}_sort',
+            format_func=lambda column: '(original order)' if column is None else str(column)
+        )
+        descending = sort_col.checkbox("Descending", key=f'{key}_descending')
+    
+    # Read the requested page before drawing its input, so the input can
+    # show the page count of the searched result
+    page_key = f'{key}_page'
+    page_df, n_rows = paginate(df, st.session_state.get(page_key, 1), page_size, sort_by, descending,
+                               search, search_columns)
+    n_pages = max(-(-n_rows // page_size), 1)
+    
+    # Keep the stored page valid when a search shrinks the result
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = page_col.number_input(
+        f"Page (of {n_pages:,}):", min_value=1, max_value=n_pages, step=1, key=page_key
+    )
+    st.dataframe(page_df, **dataframe_kwargs)
+    
+    start, stop = (page - 1) * page_size, min(page * page_size, n_rows)
+    page_bytes = payload_bytes(page_df)
+    caption = f"Rows {min(start + 1, n_rows):,}–{stop:,} of {n_rows:,} • page payload {_format_bytes(page_bytes)}"
+    if len(page_df) and n_rows > len(page_df):
+        caption += f" (all rows ≈ {_format_bytes(page_bytes / len(page_df) * n_rows)})"
+    st.caption(caption)
+    
+    return page_df
+
+def benchmark_pagination(rows=(10**4, 10**5, 10**6), page_size=PAGE_SIZE, repeat=3, seed=0):
+    """
+    Compare the payload and build time of one page with the full frame
+    
+    Parameters:
+    -----------
+    rows : sequence of int, default=(10**4, 10**5, 10**6)
+        Frame sizes to time
+    page_size : int, default=PAGE_SIZE
+        Rows per page
+    repeat : int, default=3
+        Number of timed runs per case; the best time is reported
+    seed : int, default=0
+        Random seed for the synthetic frames
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per frame size and case with the number of rows sent, the
+        payload in bytes and the best time in seconds (including serialisation)
+    """
+    import time
+    import numpy as np
+    import pandas as pd
+    
+    results = []
+    for n_rows in rows:
+        rng = np.random.default_rng(seed)
+        df = pd.DataFrame({
+            'order_id': pd.Series(np.arange(n_rows)).map('order_{:08d}'.format),
+            'order_date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365 * 86400, n_rows), unit='s'),
+            'order_value': rng.gamma(2, 50, n_rows).round(2),
+            'customer_state': pd.Categorical(rng.choice(['SP', 'RJ', 'MG', 'BA', 'PR'], n_rows))
+        })
+        cases = [
+            ('full frame', lambda: df),
+            ('first page', lambda: paginate(df, 1, page_size)[0]),
+            ('last page, sorted', lambda: paginate(df, n_rows // page_size, page_size, sort_by='order_value',
+                                                   descending=True)[0]),
+            ('first page, searched and sorted', lambda: paginate(df, 1, page_size, sort_by='order_date',
+                                                                 search='99', search_columns=['order_id'])[0])
+        ]
+        for name, build in cases:
+            best, size, sent = float('inf'), 0, 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                shown = build()
+                size = payload_bytes(shown)
+                best = min(best, time.perf_counter() - start)
+                sent = len(shown)
+            results.append({
+                'rows': n_rows,
+                'case': name,
+                'rows_sent': sent,
+                'payload_bytes': size,
+                'seconds': best
+            })
+    return pd.DataFrame(results)
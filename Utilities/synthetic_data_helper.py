@@ -0,0 +1,1129 @@
+# Synthetic Data Helper Functions
+# This file contains helper functions for generating synthetic business data
+# for the dashboard lectures, including Olist-shaped tables at any scale.
+#
+# Olist tables are generated in chunks of orders (or of products/sellers for
+# those tables). Each (table, chunk) pair draws from its own random stream,
+# so chunks can be generated in any order and one table never shifts
+# another's values. Properties that several tables need (an order's
+# purchase time, a product's seller) are derived from the integer key with
+# a hash instead of a random stream, so they agree across tables.
+
+# Product categories used by the real-time dashboard data
+REALTIME_CATEGORIES = ['Electronics', 'Fashion', 'Home & Garden', 'Books', 'Sports']
+
+# Departments of the enterprise dashboard data, and the department metrics
+# whose means EnterpriseDataStore keeps up to date
+ENTERPRISE_DEPARTMENTS = ['Sales', 'Marketing', 'Operations', 'Customer Service', 'Finance']
+ENTERPRISE_DEPT_METRICS = ['performance_score', 'target_achievement', 'budget_utilization']
+
+# Tables generate_olist_chunks can produce, and their random stream number
+OLIST_STREAMS = {
+    'customers': 0,
+    'orders': 1,
+    'order_items': 2,
+    'products': 3,
+    'sellers': 4,
+    'order_payments': 5,
+    'order_reviews': 6
+}
+
+# Rows per chunk (orders, products or sellers) when generating large tables
+SYNTHETIC_CHUNK_ROWS = 1000000
+
+# Where write_olist_parquet puts generated tables by default
+SYNTHETIC_DIR = 'Data/synthetic'
+
+# Number of products and sellers per order, as in the real Olist data
+PRODUCTS_PER_ORDER = 0.33
+SELLERS_PER_ORDER = 0.031
+
+# Mean items and payments per order are 1 / p of these geometric distributions
+ITEMS_P = 0.88
+PAYMENTS_P = 0.96
+
+# Purchase timestamps are spread over the period the Olist data covers
+PURCHASE_START = '2016-09-04'
+PURCHASE_END = '2018-10-17'
+
+# (city, state, first zip code prefix) and the share of customers/sellers there
+CITIES = {
+    ('sao paulo', 'SP', 1000): 0.16,
+    ('rio de janeiro', 'RJ', 20000): 0.07,
+    ('belo horizonte', 'MG', 30000): 0.03,
+    ('brasilia', 'DF', 70000): 0.02,
+    ('curitiba', 'PR', 80000): 0.02,
+    ('campinas', 'SP', 13000): 0.015,
+    ('porto alegre', 'RS', 90000): 0.015,
+    ('salvador', 'BA', 40000): 0.013,
+    ('guarulhos', 'SP', 7000): 0.012,
+    ('recife', 'PE', 50000): 0.01,
+    ('fortaleza', 'CE', 60000): 0.01,
+    ('goiania', 'GO', 74000): 0.01,
+    ('florianopolis', 'SC', 88000): 0.008,
+    ('ribeirao preto', 'SP', 14000): 0.008,
+    ('niteroi', 'RJ', 24000): 0.008,
+    ('other', 'SP', 15000): 0.25,
+    ('other', 'MG', 35000): 0.09,
+    ('other', 'RJ', 26000): 0.05,
+    ('other', 'RS', 95000): 0.045,
+    ('other', 'PR', 85000): 0.04,
+    ('other', 'SC', 89000): 0.03,
+    ('other', 'BA', 45000): 0.021,
+    ('other', 'ES', 29000): 0.02,
+    ('other', 'GO', 75000): 0.01,
+    ('other', 'PE', 55000): 0.007
+}
+
+# Share of orders, payments, reviews and products for each value
+ORDER_STATUSES = {
+    'delivered': 0.970,
+    'shipped': 0.011,
+    'canceled': 0.006,
+    'unavailable': 0.006,
+    'invoiced': 0.003,
+    'processing': 0.003,
+    'created': 0.0005,
+    'approved': 0.0005
+}
+
+PAYMENT_TYPES = {
+    'credit_card': 0.739,
+    'boleto': 0.190,
+    'voucher': 0.056,
+    'debit_card': 0.015
+}
+
+REVIEW_SCORES = {1: 0.115, 2: 0.032, 3: 0.082, 4: 0.193, 5: 0.578}
+
+PRODUCT_CATEGORIES = {
+    'cama_mesa_banho': 0.10,
+    'beleza_saude': 0.09,
+    'esporte_lazer': 0.08,
+    'moveis_decoracao': 0.08,
+    'informatica_acessorios': 0.07,
+    'utilidades_domesticas': 0.07,
+    'relogios_presentes': 0.06,
+    'telefonia': 0.05,
+    'ferramentas_jardim': 0.04,
+    'automotivo': 0.04,
+    'brinquedos': 0.04,
+    'cool_stuff': 0.04,
+    'perfumaria': 0.03,
+    'bebes': 0.03,
+    'eletronicos': 0.03,
+    'papelaria': 0.02,
+    'fashion_bolsas_e_acessorios': 0.02,
+    'pet_shop': 0.02,
+    'other': 0.08
+}
+
+def generate_realtime_data(days=90, freq='h', seed=None, end=None):
+    """
+    Generate realistic time-series business data, plus a per-category breakdown
+    
+    Every column is drawn with whole-array numpy operations; the category
+    breakdown is one (rows x categories) random matrix, so 5 years of hourly
+    data take less time than the old row-by-row loop needed for 90 days.
+    
+    Parameters:
+    -----------
+    days : int, default=90
+        Length of the window ending at `end`
+    freq : str, default='h'
+        Time step of the series
+    seed : int, optional
+        Seed for numpy's random Generator (None: different data on every call)
+    end : datetime, optional
+        End of the window (default: now)
+    
+    Returns:
+    --------
+    tuple of (pandas.DataFrame, pandas.DataFrame)
+        One row per time step (timestamp, orders, revenue, satisfaction,
+        customers, conversion_rate), and one row per time step and category
+        with at least one order (timestamp, category, orders, revenue)
+    """
+    import numpy as np
+    import pandas as pd
+    from datetime import datetime, timedelta
+    
+    rng = np.random.default_rng(seed)
+    
+    end_date = end if end is not None else datetime.now()
+    start_date = end_date - timedelta(days=days)
+    date_range = pd.date_range(start_date, end_date, freq=freq)
+    n = len(date_range)
+    step = np.arange(n)
+    
+    # Simulate realistic business patterns
+    base_orders = 50
+    seasonal_pattern = np.sin(step * 2 * np.pi / (24 * 7)) * 10  # Weekly pattern
+    daily_pattern = np.sin(step * 2 * np.pi / 24) * 20  # Daily pattern
+    growth_trend = step * 0.01  # Growth trend
+    noise = rng.normal(0, 5, n)
+    
+    orders = base_orders + seasonal_pattern + daily_pattern + growth_trend + noise
+    orders = np.maximum(orders, 5)  # Minimum 5 orders per hour
+    
+    # Generate correlated metrics
+    revenue = orders * rng.normal(85, 15, n)
+    satisfaction = np.clip(rng.normal(4.2, 0.3, n), 1, 5)
+    
+    df = pd.DataFrame({
+        'timestamp': date_range,
+        'orders': orders.astype(int),
+        'revenue': revenue,
+        'satisfaction': satisfaction,
+        'customers': orders * rng.uniform(0.7, 1.3, n),
+        'conversion_rate': rng.normal(3.5, 0.5, n)
+    })
+    
+    return df, expand_categories(df, REALTIME_CATEGORIES, rng)
+
+def expand_categories(df, categories, rng=None):
+    """
+    Split each row's orders over categories, keeping the (row, category)
+    pairs with at least one order
+    
+    Each category gets 10-30% of the row's orders (truncated to int) at an
+    average price of 70-120. Rows come out in the same order as a loop over
+    rows and then categories would produce them.
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Frame with 'timestamp' and integer 'orders' columns
+    categories : list of str
+        Category names
+    rng : numpy.random.Generator, optional
+        Random generator (default: a new unseeded one)
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Columns timestamp, category, orders, revenue
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    n, k = len(df), len(categories)
+    shares = rng.uniform(0.1, 0.3, (n, k))
+    prices = rng.uniform(70, 120, (n, k))
+    orders_cat = (df['orders'].to_numpy()[:, None] * shares).astype(int)
+    
+    # Flatten row-major, so each row's categories stay together
+    keep = (orders_cat > 0).ravel()
+    orders_flat = orders_cat.ravel()[keep]
+    
+    return pd.DataFrame({
+        'timestamp': np.repeat(df['timestamp'].to_numpy(), k)[keep],
+        'category': np.tile(np.asarray(categories, dtype=object), n)[keep],
+        'orders': orders_flat,
+        'revenue': orders_flat * prices.ravel()[keep]
+    })
+
+def _expand_categories_loop(df, categories):
+    """
+    Previous row-by-row implementation of `expand_categories`, for benchmarks
+    """
+    import numpy as np
+    import pandas as pd
+    
+    category_data = []
+    for _, row in df.iterrows():
+        for cat in categories:
+            orders_cat = int(row['orders'] * np.random.uniform(0.1, 0.3))
+            if orders_cat > 0:
+                category_data.append({
+                    'timestamp': row['timestamp'],
+                    'category': cat,
+                    'orders': orders_cat,
+                    'revenue': orders_cat * np.random.uniform(70, 120)
+                })
+    return pd.DataFrame(category_data)
+
+def benchmark_realtime_data(days=(90, 1825), repeat=3, include_loop=True, seed=0):
+    """
+    Time the category expansion of `generate_realtime_data` for several windows
+    
+    Parameters:
+    -----------
+    days : sequence of int, default=(90, 1825)
+        Window lengths to time (90 days and 5 years of hourly data)
+    repeat : int, default=3
+        Number of timed runs per case; the best time is reported
+    include_loop : bool, default=True
+        Also time the previous iterrows loop (seconds per run at 5 years)
+    seed : int, default=0
+        Random seed for the synthetic data
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per window and method with the number of input rows, the
+        number of category rows, the best time in seconds and rows per second
+    """
+    import time
+    import numpy as np
+    import pandas as pd
+    
+    methods = [('vectorised', lambda df: expand_categories(df, REALTIME_CATEGORIES,
+                                                          np.random.default_rng(seed)))]
+    if include_loop:
+        methods.append(('iterrows', lambda df: _expand_categories_loop(df, REALTIME_CATEGORIES)))
+    
+    results = []
+    for n_days in days:
+        df, _ = generate_realtime_data(days=n_days, seed=seed, end=pd.Timestamp('2024-01-01'))
+        for name, expand in methods:
+            best, category_rows = float('inf'), 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                category_rows = len(expand(df))
+                best = min(best, time.perf_counter() - start)
+            results.append({
+                'days': n_days,
+                'method': name,
+                'rows': len(df),
+                'category_rows': category_rows,
+                'seconds': best,
+                'rows_per_second': len(df) / best
+            })
+    
+    return pd.DataFrame(results)
+
+
+def table_rng(seed, table, chunk=0):
+    """
+    Independent numpy random Generator for one table (and chunk)
+    
+    The streams come from np.random.SeedSequence(seed, spawn_key=...), so
+    different tables and chunks never share random numbers, and every call
+    with the same arguments gives the same stream.
+    
+    Parameters:
+    -----------
+    seed : int
+        Seed of the whole synthetic dataset
+    table : str
+        Name of the table (or any other stream name, e.g. an app's data set)
+    chunk : int, default=0
+        Chunk number, for tables generated in chunks
+    
+    Returns:
+    --------
+    numpy.random.Generator
+    """
+    import zlib
+    import numpy as np
+    
+    stream = OLIST_STREAMS.get(table, zlib.crc32(table.encode()))
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(stream, chunk)))
+
+def _splitmix64(x):
+    """
+    SplitMix64 mixing function: a bijection on uint64 whose outputs look random
+    """
+    import numpy as np
+    
+    x = np.asarray(x, dtype='uint64') + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def _key_hash(keys, salt):
+    """
+    Deterministic pseudo-random uint64 for each integer key and salt string
+    """
+    import zlib
+    import numpy as np
+    
+    salt = np.uint64(zlib.crc32(salt.encode()) << 32)
+    return _splitmix64(np.asarray(keys, dtype='uint64') ^ salt)
+
+def _key_uniform(keys, salt):
+    """
+    Deterministic uniform [0, 1) float for each integer key
+    """
+    return (_key_hash(keys, salt) >> 11).astype('float64') * 2.0 ** -53
+
+def hex_ids(keys, salt):
+    """
+    Olist-style 32 character hexadecimal IDs for integer keys
+    
+    The IDs are two SplitMix64 hashes of the key, written out with a
+    lookup table in numpy, without formatting one Python string per row.
+    Different keys always get different IDs (the hash is a bijection), and
+    the salt (e.g. the table name) makes order and customer IDs differ.
+    
+    Parameters:
+    -----------
+    keys : array-like of int
+        Integer keys (row numbers)
+    salt : str
+        Name of the ID column or table
+    
+    Returns:
+    --------
+    numpy.ndarray
+        Fixed width bytes (dtype 'S32'); see `_to_str` for pandas strings
+    """
+    import numpy as np
+    
+    keys = np.asarray(keys, dtype='uint64')
+    words = np.empty((len(keys), 2), dtype='>u8')  # big-endian: bytes come out in order
+    words[:, 0] = _key_hash(keys, salt)
+    words[:, 1] = _key_hash(keys, salt + ':low')
+    
+    digits = np.frombuffer(b'0123456789abcdef', dtype='uint8')
+    nibbles = words.view('uint8').reshape(len(keys), 16)
+    text = np.empty((len(keys), 32), dtype='uint8')
+    text[:, 0::2] = digits[nibbles >> 4]
+    text[:, 1::2] = digits[nibbles & 15]
+    return text.view('S32').ravel()
+
+def format_ids(keys, prefix, width):
+    """
+    Format integer keys as prefixed, zero-padded IDs, e.g. ORD_00000001
+    
+    Gives the same text as f"{prefix}{key:0{width}d}" for every key, but the
+    digits are computed for all keys at once in numpy and converted to a
+    pandas string array in one step (through Arrow when available), so no
+    Python string is created per row.
+    
+    Parameters:
+    -----------
+    keys : array-like of int
+        Non-negative integer keys
+    prefix : str
+        ASCII text before the number (e.g. 'ORD_')
+    width : int
+        Minimum number of digits; larger keys get more digits, like f-strings
+    
+    Returns:
+    --------
+    pandas.arrays.StringArray or ArrowStringArray
+    """
+    import numpy as np
+    import pandas as pd
+    
+    keys = np.asarray(keys, dtype='int64')
+    if len(keys) and keys.min() < 0:
+        raise ValueError("format_ids only supports non-negative keys")
+    
+    n_digits = np.maximum(width, np.searchsorted(10 ** np.arange(1, 19, dtype='int64'), keys,
+                                                 side='right') + 1)
+    if (n_digits == width).all():
+        return _format_fixed_width(keys, prefix, width)
+    
+    # Some keys need more than `width` digits: format each length separately
+    parts = [pd.Series(_format_fixed_width(keys[n_digits == d], prefix, d),
+                       index=np.flatnonzero(n_digits == d))
+             for d in np.unique(n_digits)]
+    return pd.concat(parts).sort_index().array
+
+def _format_fixed_width(keys, prefix, width):
+    """
+    Format keys that all have at most `width` digits (see `format_ids`)
+    """
+    import numpy as np
+    
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype='int64')
+    text = np.empty((len(keys), len(prefix) + width), dtype='uint8')
+    text[:, :len(prefix)] = np.frombuffer(prefix.encode('ascii'), dtype='uint8')
+    text[:, len(prefix):] = (keys[:, None] // powers) % 10 + ord('0')
+    return _to_str(text.view(f'S{text.shape[1]}').ravel())
+
+def id_column(keys, prefix, width, unique=False):
+    """
+    Integer-backed ID column for a DataFrame
+    
+    IDs that repeat (e.g. the customer of each order) become a Categorical:
+    the rows store integer codes and only the distinct keys are formatted.
+    Unique IDs (e.g. order IDs) are formatted directly with `format_ids`.
+    Either way the column displays and exports like the f-string IDs and
+    supports .str methods, value_counts and groupby.
+    
+    Parameters:
+    -----------
+    keys : array-like of int
+        Integer key of each row
+    prefix, width
+        See `format_ids`
+    unique : bool, default=False
+        Whether every key occurs once
+    
+    Returns:
+    --------
+    pandas.Categorical or pandas string array
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if unique:
+        return format_ids(keys, prefix, width)
+    
+    uniques, codes = np.unique(np.asarray(keys, dtype='int64'), return_inverse=True)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(format_ids(uniques, prefix, width)))
+
+def _to_str(values):
+    """
+    Convert fixed width ASCII bytes to a pandas string array
+    """
+    import pandas as pd
+    
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return pd.array(values.astype('U'), dtype='str')
+    
+    # Arrow converts the bytes in one step, several times faster than numpy's 'U' dtype
+    strings = pa.array(values, type=pa.binary(values.dtype.itemsize)).cast(pa.string())
+    return pd.array(pd.arrays.ArrowStringArray(strings), dtype='str')
+
+def _choose(rng, choices, n):
+    """
+    Draw n values from a {value: probability} dict as a pandas Categorical
+    """
+    import numpy as np
+    import pandas as pd
+    
+    probabilities = np.fromiter(choices.values(), dtype='float64')
+    codes = rng.choice(len(choices), n, p=probabilities / probabilities.sum())
+    return pd.Categorical.from_codes(codes, categories=list(choices))
+
+def _purchase_times(order_keys):
+    """
+    Purchase timestamp of each order, derived from the order key
+    """
+    import numpy as np
+    
+    start = np.datetime64(PURCHASE_START, 's')
+    span = (np.datetime64(PURCHASE_END, 's') - start).astype('int64')
+    offsets = (_key_uniform(order_keys, 'purchase') * span).astype('int64')
+    return start + offsets.astype('timedelta64[s]')
+
+def _seconds(values):
+    """
+    Float seconds as a timedelta64[s] array
+    """
+    return values.astype('int64').astype('timedelta64[s]')
+
+def olist_table_sizes(n_orders):
+    """
+    Number of customers, orders, products and sellers for a given number of orders
+    
+    order_items, order_payments and order_reviews have about 1.14, 1.04 and
+    1 rows per order; their exact size depends on the seed.
+    """
+    return {
+        'customers': n_orders,
+        'orders': n_orders,
+        'products': max(1, int(n_orders * PRODUCTS_PER_ORDER)),
+        'sellers': max(1, int(n_orders * SELLERS_PER_ORDER))
+    }
+
+def _id_column(keys, salt, string_ids):
+    """
+    ID column from integer keys: Olist-style hex strings or the int64 keys
+    """
+    return _to_str(hex_ids(keys, salt)) if string_ids else keys
+
+def _places(rng, n, prefix):
+    """
+    Zip code prefix, city and state columns (customers and sellers)
+    """
+    import numpy as np
+    import pandas as pd
+    
+    codes = _choose(rng, CITIES, n).codes
+    city_names = sorted({city for city, _, _ in CITIES})
+    state_names = sorted({state for _, state, _ in CITIES})
+    city_codes = np.array([city_names.index(city) for city, _, _ in CITIES])
+    state_codes = np.array([state_names.index(state) for _, state, _ in CITIES])
+    zip_base = np.array([zip_code for _, _, zip_code in CITIES], dtype='int32')
+    
+    return {
+        f'{prefix}_zip_code_prefix': zip_base[codes] + rng.integers(0, 1000, n, dtype='int32'),
+        f'{prefix}_city': pd.Categorical.from_codes(city_codes[codes], categories=city_names),
+        f'{prefix}_state': pd.Categorical.from_codes(state_codes[codes], categories=state_names)
+    }
+
+def _children(rng, order_keys, p):
+    """
+    Repeat order keys for a geometric number (>= 1) of child rows per order,
+    and number the children of each order from 1
+    """
+    import numpy as np
+    
+    counts = rng.geometric(p, len(order_keys))
+    parents = np.repeat(order_keys, counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return parents, np.arange(len(parents)) - starts + 1
+
+def _olist_chunk(table, keys, rng, sizes, string_ids):
+    """
+    One chunk of a synthetic Olist table for the given order (or product/seller) keys
+    """
+    import numpy as np
+    import pandas as pd
+    
+    n = len(keys)
+    day = 86400
+    
+    if table == 'customers':
+        # Like Olist, every order has its own customer_id; repeat buyers share
+        # a customer_unique_id
+        unique_keys = np.where(rng.random(n) < 0.97, keys, rng.integers(0, keys + 1))
+        return pd.DataFrame({
+            'customer_id': _id_column(keys, 'customer', string_ids),
+            'customer_unique_id': _id_column(unique_keys, 'customer_unique', string_ids),
+            **_places(rng, n, 'customer')
+        })
+    
+    if table == 'orders':
+        status = _choose(rng, ORDER_STATUSES, n)
+        purchase = _purchase_times(keys)
+        approved = purchase + _seconds(rng.exponential(10 * 3600, n))
+        carrier = approved + _seconds(rng.gamma(2, 1.5 * day, n))
+        delivered = carrier + _seconds(rng.gamma(3, 3 * day, n))
+        estimated = (purchase.astype('datetime64[D]') +
+                     rng.integers(10, 40, n).astype('timedelta64[D]')).astype('datetime64[s]')
+        
+        not_shipped = status.isin(['created', 'approved', 'invoiced', 'processing',
+                                   'canceled', 'unavailable'])
+        approved[status == 'created'] = np.datetime64('NaT')
+        carrier[not_shipped] = np.datetime64('NaT')
+        delivered[status != 'delivered'] = np.datetime64('NaT')
+        
+        return pd.DataFrame({
+            'order_id': _id_column(keys, 'order', string_ids),
+            'customer_id': _id_column(keys, 'customer', string_ids),
+            'order_status': status,
+            'order_purchase_timestamp': purchase,
+            'order_approved_at': approved,
+            'order_delivered_carrier_date': carrier,
+            'order_delivered_customer_date': delivered,
+            'order_estimated_delivery_date': estimated
+        })
+    
+    if table == 'order_items':
+        order_keys, item_ids = _children(rng, keys, ITEMS_P)
+        # Popular products get most of the sales
+        product_keys = (sizes['products'] * rng.random(len(order_keys)) ** 3).astype('int64')
+        seller_keys = (_key_hash(product_keys, 'seller') % np.uint64(sizes['sellers'])).astype('int64')
+        return pd.DataFrame({
+            'order_id': _id_column(order_keys, 'order', string_ids),
+            'order_item_id': item_ids.astype('int8'),
+            'product_id': _id_column(product_keys, 'product', string_ids),
+            'seller_id': _id_column(seller_keys, 'seller', string_ids),
+            'shipping_limit_date': _purchase_times(order_keys) + np.timedelta64(6 * day, 's'),
+            'price': np.round(rng.lognormal(4.4, 0.8, len(order_keys)), 2),
+            'freight_value': np.round(rng.lognormal(2.9, 0.5, len(order_keys)), 2)
+        })
+    
+    if table == 'order_payments':
+        order_keys, sequential = _children(rng, keys, PAYMENTS_P)
+        payment_type = _choose(rng, PAYMENT_TYPES, len(order_keys))
+        installments = np.where(payment_type == 'credit_card',
+                                rng.integers(1, 11, len(order_keys)), 1)
+        return pd.DataFrame({
+            'order_id': _id_column(order_keys, 'order', string_ids),
+            'payment_sequential': sequential.astype('int8'),
+            'payment_type': payment_type,
+            'payment_installments': installments.astype('int8'),
+            'payment_value': np.round(rng.lognormal(4.7, 0.8, len(order_keys)), 2)
+        })
+    
+    if table == 'order_reviews':
+        created = (_purchase_times(keys) + _seconds(rng.gamma(4, 3 * day, n))).astype('datetime64[D]')
+        no_comment = pd.array(np.full(n, None), dtype='str')
+        return pd.DataFrame({
+            'review_id': _id_column(keys, 'review', string_ids),
+            'order_id': _id_column(keys, 'order', string_ids),
+            'review_score': np.asarray(_choose(rng, REVIEW_SCORES, n), dtype='int8'),
+            'review_comment_title': no_comment,
+            'review_comment_message': no_comment,
+            'review_creation_date': created.astype('datetime64[s]'),
+            'review_answer_timestamp': created.astype('datetime64[s]') + _seconds(rng.exponential(2.5 * day, n))
+        })
+    
+    if table == 'products':
+        return pd.DataFrame({
+            'product_id': _id_column(keys, 'product', string_ids),
+            'product_category_name': _choose(rng, PRODUCT_CATEGORIES, n),
+            'product_name_lenght': rng.integers(5, 77, n).astype('float32'),
+            'product_description_lenght': rng.integers(4, 4000, n).astype('float32'),
+            'product_photos_qty': rng.geometric(0.55, n).astype('float32'),
+            'product_weight_g': np.round(rng.lognormal(6.8, 1.2, n)).astype('float32'),
+            'product_length_cm': rng.integers(7, 106, n).astype('float32'),
+            'product_height_cm': rng.integers(2, 106, n).astype('float32'),
+            'product_width_cm': rng.integers(6, 119, n).astype('float32')
+        })
+    
+    if table == 'sellers':
+        return pd.DataFrame({
+            'seller_id': _id_column(keys, 'seller', string_ids),
+            **_places(rng, n, 'seller')
+        })
+    
+    raise ValueError(f"Unknown table: {table}. Available tables: {', '.join(OLIST_STREAMS)}")
+
+def generate_olist_chunks(table_name, n_orders, seed=0, chunk_rows=SYNTHETIC_CHUNK_ROWS,
+                          string_ids=True):
+    """
+    Generate a synthetic Olist table chunk by chunk
+    
+    The tables have the columns and dtypes of the real Olist files as loaded
+    by olist_helper.load_olist_data, and they join together (every order has
+    a customer, its items point at existing products and sellers). Memory
+    use is bounded by the chunk size, so 10^8 orders can be generated and
+    written to Parquet on a laptop.
+    
+    The same (seed, chunk_rows) always gives the same data, and each table
+    and chunk draws from its own random stream (see `table_rng`).
+    
+    Parameters:
+    -----------
+    table_name : str
+        One of the keys of OLIST_STREAMS
+    n_orders : int
+        Number of orders in the dataset; the other tables are sized from it
+        (see `olist_table_sizes`)
+    seed : int, default=0
+        Seed of the dataset
+    chunk_rows : int, default=SYNTHETIC_CHUNK_ROWS
+        Orders (or products/sellers) per chunk; order_items and
+        order_payments chunks have a few more rows
+    string_ids : bool, default=True
+        Write Olist-style 32 character hex IDs; with False the ID columns
+        hold the int64 keys, which is much faster for load tests
+    
+    Yields:
+    -------
+    pandas.DataFrame
+        One chunk of the table
+    """
+    import numpy as np
+    
+    if table_name not in OLIST_STREAMS:
+        raise ValueError(f"Unknown table: {table_name}. Available tables: {', '.join(OLIST_STREAMS)}")
+    
+    sizes = olist_table_sizes(n_orders)
+    n_rows = sizes.get(table_name, n_orders)
+    for chunk, start in enumerate(range(0, n_rows, chunk_rows)):
+        keys = np.arange(start, min(start + chunk_rows, n_rows), dtype='int64')
+        yield _olist_chunk(table_name, keys, table_rng(seed, table_name, chunk), sizes, string_ids)
+
+def generate_olist_table(table_name, n_orders, seed=0, chunk_rows=SYNTHETIC_CHUNK_ROWS,
+                         string_ids=True):
+    """
+    Generate a whole synthetic Olist table in memory
+    
+    Takes the same arguments as `generate_olist_chunks` and concatenates
+    its chunks; use `write_olist_parquet` for tables that do not fit in memory.
+    
+    Returns:
+    --------
+    pandas.DataFrame
+    """
+    import pandas as pd
+    
+    chunks = list(generate_olist_chunks(table_name, n_orders, seed=seed,
+                                        chunk_rows=chunk_rows, string_ids=string_ids))
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+def write_olist_parquet(n_orders, output_dir=None, tables=None, seed=0,
+                        chunk_rows=SYNTHETIC_CHUNK_ROWS, string_ids=True):
+    """
+    Generate synthetic Olist tables and stream them to Parquet files
+    
+    Chunks are written as row groups as soon as they are generated, so only
+    one chunk per table is in memory at a time. Files are written under a
+    temporary name and renamed when complete.
+    
+    Parameters:
+    -----------
+    n_orders : int
+        Number of orders (10^4 to 10^8 is a sensible range)
+    output_dir : str, optional
+        Directory for the files (default: SYNTHETIC_DIR/<n_orders>-<seed>)
+    tables : list of str, optional
+        Tables to write (default: all of OLIST_STREAMS)
+    seed, chunk_rows, string_ids
+        See `generate_olist_chunks`
+    
+    Returns:
+    --------
+    dict
+        Table name -> path of the Parquet file, named like the Olist CSV
+        (e.g. olist_orders_dataset.parquet)
+    """
+    import os
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from .olist_helper import TABLE_MAP
+    
+    if output_dir is None:
+        output_dir = os.path.join(SYNTHETIC_DIR, f'{n_orders}-{seed}')
+    os.makedirs(output_dir, exist_ok=True)
+    
+    paths = {}
+    for table_name in tables or list(OLIST_STREAMS):
+        path = os.path.join(output_dir, os.path.splitext(TABLE_MAP[table_name])[0] + '.parquet')
+        tmp_path = path + '.tmp'
+        writer = None
+        try:
+            for chunk in generate_olist_chunks(table_name, n_orders, seed=seed,
+                                               chunk_rows=chunk_rows, string_ids=string_ids):
+                batch = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, batch.schema)
+                writer.write_table(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_path, path)
+        paths[table_name] = path
+    
+    return paths
+
+def benchmark_olist_generator(n_orders=(10**4, 10**5, 10**6), seed=0, string_ids=True):
+    """
+    Time generate_olist_table for every table at several dataset sizes
+    
+    Parameters:
+    -----------
+    n_orders : sequence of int, default=(10**4, 10**5, 10**6)
+        Dataset sizes to time
+    seed : int, default=0
+        Seed of the datasets
+    string_ids : bool, default=True
+        Passed to generate_olist_table
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per size and table with the rows generated, the time in
+        seconds and rows per second
+    """
+    import time
+    import pandas as pd
+    
+    results = []
+    for size in n_orders:
+        for table_name in OLIST_STREAMS:
+            start = time.perf_counter()
+            n_rows = len(generate_olist_table(table_name, size, seed=seed, string_ids=string_ids))
+            elapsed = time.perf_counter() - start
+            results.append({
+                'n_orders': size,
+                'table': table_name,
+                'rows': n_rows,
+                'seconds': elapsed,
+                'rows_per_second': n_rows / elapsed
+            })
+    
+    return pd.DataFrame(results)
+
+def generate_enterprise_days(dates, origin, departments, team_sizes, rng):
+    """
+    Enterprise dashboard data for the given days
+    
+    Parameters:
+    -----------
+    dates : pandas.DatetimeIndex
+        Days to generate
+    origin : pandas.Timestamp
+        First day of the data; the growth trend counts days from here
+    departments : list of str
+        Department names
+    team_sizes : array-like of int
+        Team size of each department
+    rng : numpy.random.Generator
+        Random generator
+    
+    Returns:
+    --------
+    tuple of (pandas.DataFrame, pandas.DataFrame)
+        One row per day (date, orders, revenue, customer_satisfaction,
+        new_customers, returning_customers, conversion_rate,
+        avg_order_value), and one row per department and day (date,
+        department, performance_score, target_achievement, team_size,
+        budget_utilization)
+    """
+    import numpy as np
+    import pandas as pd
+    
+    n = len(dates)
+    step = np.asarray((dates - origin).days)
+    
+    # Simulate business growth and seasonality
+    base_orders = 1000
+    growth_trend = step * 2
+    seasonal = np.sin(step * 2 * np.pi / 30) * 100  # Monthly cycle
+    weekly = np.sin(step * 2 * np.pi / 7) * 50      # Weekly cycle
+    noise = rng.normal(0, 50, n)
+    
+    daily_orders = base_orders + growth_trend + seasonal + weekly + noise
+    daily_orders = np.maximum(daily_orders, 100)  # Minimum orders
+    
+    # Generate correlated business metrics
+    revenue_per_order = rng.normal(85, 15, n)
+    customer_satisfaction = np.clip(rng.normal(4.2, 0.4, n), 1, 5)
+    
+    main_df = pd.DataFrame({
+        'date': dates,
+        'orders': daily_orders.astype(int),
+        'revenue': daily_orders * revenue_per_order,
+        'customer_satisfaction': customer_satisfaction,
+        'new_customers': (daily_orders * rng.uniform(0.3, 0.7, n)).astype(int),
+        'returning_customers': (daily_orders * rng.uniform(0.3, 0.7, n)).astype(int),
+        'conversion_rate': rng.normal(3.8, 0.6, n),
+        'avg_order_value': revenue_per_order
+    })
+    
+    return main_df, department_frame(dates, departments, team_sizes, rng)
+
+def department_frame(dates, departments, team_sizes, rng):
+    """
+    One row per day and department, built in one step
+    
+    The rows are the product of the dates and the departments (a date x
+    department MultiIndex, reset to columns), and every metric is a single
+    random draw of n_days * n_departments values, so hundreds of departments
+    or cost centres cost no more than a few wide columns. `department` is
+    a categorical column.
+    
+    Parameters:
+    -----------
+    dates : pandas.DatetimeIndex
+        Days to generate
+    departments : list of str
+        Department names (unique)
+    team_sizes : array-like of int
+        Team size of each department
+    rng : numpy.random.Generator
+        Random generator
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        Columns date, department, performance_score, target_achievement,
+        team_size, budget_utilization, sorted by date then department
+    """
+    import numpy as np
+    import pandas as pd
+    
+    n_rows = len(dates) * len(departments)
+    index = pd.MultiIndex.from_product(
+        [dates, pd.CategoricalIndex(departments, categories=departments)],
+        names=['date', 'department'])
+    
+    return pd.DataFrame({
+        'performance_score': rng.uniform(0.7, 1.3, n_rows),
+        'target_achievement': np.clip(rng.normal(95, 10, n_rows), 60, 130),
+        'team_size': np.tile(np.asarray(team_sizes), len(dates)),
+        'budget_utilization': rng.uniform(0.8, 1.1, n_rows)
+    }, index=index).reset_index()
+
+def _department_frame_loop(dates, departments, team_sizes, rng):
+    """
+    Previous per-department implementation of `department_frame`, for benchmarks
+    """
+    import numpy as np
+    import pandas as pd
+    
+    n = len(dates)
+    dept_data = []
+    for dept, team_size in zip(departments, team_sizes):
+        dept_data.append(pd.DataFrame({
+            'date': dates,
+            'department': dept,
+            'performance_score': rng.uniform(0.7, 1.3, n),
+            'target_achievement': np.clip(rng.normal(95, 10, n), 60, 130),
+            'team_size': team_size,
+            'budget_utilization': rng.uniform(0.8, 1.1, n)
+        }))
+    return pd.concat(dept_data, ignore_index=True)
+
+def benchmark_department_frame(n_departments=(5, 100, 1000), days=180, repeat=3, seed=0):
+    """
+    Time department_frame against the previous per-department loop
+    
+    Parameters:
+    -----------
+    n_departments : sequence of int, default=(5, 100, 1000)
+        Numbers of departments (cost centres) to time
+    days : int, default=180
+        Number of days
+    repeat : int, default=3
+        Number of timed runs per case; the best time is reported
+    seed : int, default=0
+        Random seed
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per department count and method with the rows built, the
+        best time in seconds and the memory used by the frame in MB
+    """
+    import time
+    import numpy as np
+    import pandas as pd
+    
+    dates = pd.date_range('2024-01-01', periods=days, freq='D')
+    methods = [('broadcast', department_frame), ('loop + concat', _department_frame_loop)]
+    
+    results = []
+    for k in n_departments:
+        departments = [f'Cost Centre {i:04d}' for i in range(k)]
+        team_sizes = np.random.default_rng(seed).integers(5, 25, k)
+        for name, build in methods:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                frame = build(dates, departments, team_sizes, np.random.default_rng(seed))
+                best = min(best, time.perf_counter() - start)
+            results.append({
+                'departments': k,
+                'method': name,
+                'rows': len(frame),
+                'seconds': best,
+                'memory_mb': frame.memory_usage(deep=True).sum() / 1e6
+            })
+    
+    return pd.DataFrame(results)
+
+class EnterpriseDataStore:
+    """
+    Rolling store of the enterprise dashboard data
+    
+    The first call generates the last `days` days. After that, `refresh`
+    only generates the days after the watermark (the last day in the
+    store), appends them, and adds them to the running aggregates (monthly
+    revenue and orders, department sums), so nothing already in the store
+    is generated or aggregated again. Days that fall out of the window are
+    dropped and subtracted from the aggregates, so a long-running server
+    keeps `days` + 1 days in memory. The growth trend keeps counting from
+    the first day the store was created, so orders and revenue keep rising
+    for as long as the store lives.
+    
+    Each refresh draws from its own random stream, keyed on the first new
+    day (see `table_rng`), and team sizes are fixed when the store is
+    created, so the data only depends on the seed and the refresh days.
+    """
+    
+    def __init__(self, days=180, departments=None, seed=42, today=None):
+        import threading
+        import pandas as pd
+        
+        # Streamlit sessions run in threads and share the store
+        self._lock = threading.Lock()
+        self.seed = seed
+        self.days = days
+        self.departments = list(departments or ENTERPRISE_DEPARTMENTS)
+        today = pd.Timestamp(today if today is not None else pd.Timestamp.now()).normalize()
+        self.origin = today - pd.Timedelta(days=days)
+        self.watermark = self.origin - pd.Timedelta(days=1)
+        self.team_sizes = table_rng(seed, 'enterprise_teams').integers(5, 25, len(self.departments))
+        
+        self.main_df = None
+        self.dept_df = None
+        self.monthly = None
+        self._dept_sums = None
+        self._dept_counts = None
+        self.version = 0
+        
+        self.refresh(today)
+    
+    def refresh(self, today=None):
+        """
+        Append the days after the watermark up to `today` (default: now)
+        
+        Returns the number of days added (0 if the store is up to date).
+        """
+        import pandas as pd
+        
+        today = pd.Timestamp(today if today is not None else pd.Timestamp.now()).normalize()
+        with self._lock:
+            return self._append_days(today)
+    
+    def _append_days(self, today):
+        """
+        Generate and append the days after the watermark (called with the lock held)
+        """
+        import pandas as pd
+        
+        dates = pd.date_range(self.watermark + pd.Timedelta(days=1), today, freq='D')
+        if len(dates) == 0:
+            return 0
+        
+        rng = table_rng(self.seed, 'enterprise_data', (dates[0] - self.origin).days)
+        main_df, dept_df = generate_enterprise_days(dates, self.origin, self.departments,
+                                                    self.team_sizes, rng)
+        
+        if self.main_df is None:
+            self.main_df, self.dept_df = main_df, dept_df
+        else:
+            self.main_df = pd.concat([self.main_df, main_df], ignore_index=True)
+            self.dept_df = pd.concat([self.dept_df, dept_df], ignore_index=True)
+        self._update_aggregates(main_df, dept_df)
+        self._drop_days_before(dates[-1] - pd.Timedelta(days=self.days))
+        
+        self.watermark = dates[-1]
+        self.version += 1
+        return len(dates)
+    
+    def _drop_days_before(self, start):
+        """
+        Drop the rows dated before `start` and remove them from the aggregates
+        (called with the lock held)
+        """
+        # Both frames are sorted by date
+        n_main = self.main_df['date'].searchsorted(start)
+        if n_main == 0:
+            return
+        n_dept = self.dept_df['date'].searchsorted(start)
+        
+        self._update_aggregates(self.main_df.iloc[:n_main], self.dept_df.iloc[:n_dept], remove=True)
+        self.main_df = self.main_df.iloc[n_main:].reset_index(drop=True)
+        self.dept_df = self.dept_df.iloc[n_dept:].reset_index(drop=True)
+        
+        # Months that are now empty have no rows left to total
+        self.monthly = self.monthly[self.monthly.index >= start.to_period('M')]
+    
+    def _update_aggregates(self, main_df, dept_df, remove=False):
+        """
+        Add newly appended rows to the running aggregates (or, with
+        remove=True, subtract dropped rows from them)
+        """
+        monthly = main_df.groupby(main_df['date'].dt.to_period('M'))[['revenue', 'orders']].sum()
+        dept_groups = dept_df.groupby('department', sort=False, observed=True)
+        dept_sums = dept_groups[ENTERPRISE_DEPT_METRICS].sum()
+        dept_counts = dept_groups.size()
+        
+        if self.monthly is None:
+            self.monthly, self._dept_sums, self._dept_counts = monthly, dept_sums, dept_counts
+        elif remove:
+            self.monthly = self.monthly.sub(monthly, fill_value=0).astype(monthly.dtypes)
+            self._dept_sums = self._dept_sums.sub(dept_sums, fill_value=0)
+            self._dept_counts = self._dept_counts.sub(dept_counts, fill_value=0)
+        else:
+            # Only the month the watermark is in can already have a partial total
+            self.monthly = self.monthly.add(monthly, fill_value=0).astype(monthly.dtypes)
+            self._dept_sums = self._dept_sums.add(dept_sums, fill_value=0)
+            self._dept_counts = self._dept_counts.add(dept_counts, fill_value=0)
+    
+    @property
+    def dept_means(self):
+        """
+        Mean of each ENTERPRISE_DEPT_METRICS column per department, plus team_size
+        """
+        means = self._dept_sums.div(self._dept_counts, axis=0).loc[self.departments]
+        means['team_size'] = self.team_sizes
+        return means
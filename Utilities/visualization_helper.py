@@ -1,13 +1,88 @@
 # Visualization Helper Functions
 # This file contains helper functions for creating visualizations
 
-def set_plotting_style():
+import functools
+import threading
+from collections import OrderedDict
+
+# Whether set_plotting_style has already applied the course style
+_STYLE_APPLIED = False
+
+# Above this many values, plot_numeric_distribution switches to binned mode
+LARGE_N_THRESHOLD = 1000000
+
+# Number of values processed at a time in binned mode (bounds temporary memory)
+CHUNK_SIZE = 1000000
+
+# Each displayed histogram bin is split into this many fine bins, which are
+# used for the approximate median and the binned KDE
+FINE_BINS_PER_BIN = 64
+
+# Partial aggregates kept by build_daily_rollup: name -> (build, merge). `build`
+# maps the raw values to the series that is reduced, and `merge` is the pandas
+# reduction used both within a day and when merging days into longer periods.
+ROLLUP_PARTIALS = {
+    'count': (lambda values: values.notna().astype('int64'), 'sum'),
+    'sum': (lambda values: values, 'sum'),
+    'sumsq': (lambda values: values.astype('float64') ** 2, 'sum'),
+    'min': (lambda values: values, 'min'),
+    'max': (lambda values: values, 'max')
+}
+
+# Aggregates plot_time_series can show, computed from merged partials.
+# Add an entry to support another aggregate that can be built from ROLLUP_PARTIALS.
+ROLLUP_AGGREGATES = {
+    'count': lambda p: p['count'],
+    'sum': lambda p: p['sum'],
+    'mean': lambda p: p['sum'] / p['count'],
+    'min': lambda p: p['min'],
+    'max': lambda p: p['max'],
+    'var': lambda p: (p['sumsq'] - p['sum'] ** 2 / p['count']) / (p['count'] - 1),
+    'std': lambda p: ((p['sumsq'] - p['sum'] ** 2 / p['count']) / (p['count'] - 1)).clip(lower=0) ** 0.5
+}
+
+# Daily rollups of recently plotted columns, keyed on their content and
+# least recently used first, see _cached_daily_rollup
+ROLLUP_CACHE_MAX_ENTRIES = 16
+_ROLLUP_CACHE = OrderedDict()
+_ROLLUP_CACHE_LOCK = threading.Lock()
+
+# Rendered figures kept by the figure cache, least recently used first
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FIGURE_FORMAT = 'png'
+_FIGURE_CACHE = OrderedDict()
+_FIGURE_CACHE_STATS = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+# Guards the figure cache and its counters (Streamlit runs sessions in threads)
+_FIGURE_CACHE_LOCK = threading.Lock()
+
+# Serialises drawing and saving of cached plots: pyplot's current figure is
+# shared by all threads, so only one cached plot is drawn at a time
+_FIGURE_RENDER_LOCK = threading.RLock()
+
+# Per-thread flag set while a cached plot is drawn, so _show_figure leaves
+# the figure open for the cache to save
+_CAPTURE_FIGURES = threading.local()
+
+def set_plotting_style(force=False):
     """
     Set consistent plotting style for the course
+    
+    The style is only applied on the first call (every plot_* helper calls
+    this function), so later calls just return the modules.
+    
+    Parameters:
+    -----------
+    force : bool, default=False
+        Apply the style again, e.g. after changing rcParams by hand
     """
+    global _STYLE_APPLIED
     import matplotlib.pyplot as plt
     import seaborn as sns
     
+    if _STYLE_APPLIED and not force:
+        return plt, sns
+    
     plt.style.use('seaborn-v0_8-whitegrid')
     sns.set(font_scale=1.2)
     sns.set_palette('viridis')
@@ -23,12 +98,390 @@ def set_plotting_style():
     # Figure size
     plt.rcParams['figure.figsize'] = [12, 8]
     
+    _STYLE_APPLIED = True
     return plt, sns
 
-def plot_numeric_distribution(df, column, bins=30, kde=True):
+def data_fingerprint(obj):
+    """
+    Fingerprint of the data a figure is drawn from
+    
+    DataFrames, Series and numpy arrays are hashed in full with pandas'
+    vectorised row hashing (milliseconds for a few hundred thousand rows,
+    far less than drawing the chart); other values are fingerprinted by
+    their repr. Returns None for values that cannot be fingerprinted
+    reliably, e.g. iterators of chunks, and such calls are not cached.
+    """
+    import hashlib
+    import numpy as np
+    import pandas as pd
+    
+    if isinstance(obj, np.ndarray):
+        obj = pd.Series(obj.ravel())
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        try:
+            row_hashes = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+        except TypeError:
+            # Unhashable cells, e.g. lists
+            return None
+        digest = hashlib.sha1(row_hashes.tobytes())
+        if isinstance(obj, pd.DataFrame):
+            layout = (list(obj.columns), [str(dtype) for dtype in obj.dtypes])
+        else:
+            layout = (obj.name, str(obj.dtype))
+        digest.update(repr(layout).encode())
+        return f'{type(obj).__name__}{obj.shape}:{digest.hexdigest()}'
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return repr(obj)
+    if isinstance(obj, (list, tuple, dict)):
+        items = list(obj.items() if isinstance(obj, dict) else enumerate(obj))
+        parts = [(key, data_fingerprint(value)) for key, value in items]
+        if any(part is None for _, part in parts):
+            return None
+        return repr((type(obj).__name__, parts))
+    if callable(obj):
+        return f'{getattr(obj, "__module__", "")}.{getattr(obj, "__qualname__", repr(obj))}'
+    return None
+
+def _named_columns(values):
+    """
+    Strings among a call's arguments (looking inside lists, tuples and dicts),
+    i.e. the column names a plot may use
+    """
+    names = set()
+    for value in values:
+        if isinstance(value, str):
+            names.add(value)
+        elif isinstance(value, (list, tuple)):
+            names |= _named_columns(value)
+        elif isinstance(value, dict):
+            names |= _named_columns(value.values())
+    return names
+
+def _figure_key(func, args, kwargs, cache_key=None):
+    """
+    Cache key of a call: the function plus the fingerprint of every argument
+    (defaults included), or None if an argument cannot be fingerprinted
+    
+    Only the DataFrame columns named by the other arguments (e.g. `column`,
+    or x= and y= of a Plotly Express call) are hashed; the whole frame is
+    hashed only when no argument names one of its columns. With an explicit
+    `cache_key`, DataFrames and Series are not hashed at all: the key stands
+    for the data.
+    """
+    import inspect
+    import pandas as pd
+    
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    
+    data_types = (pd.DataFrame, pd.Series)
+    names = _named_columns(value for value in bound.arguments.values()
+                           if not isinstance(value, data_types))
+    
+    parts = [] if cache_key is None else [('cache_key', cache_key)]
+    for name, value in bound.arguments.items():
+        if isinstance(value, data_types) and cache_key is not None:
+            continue
+        if isinstance(value, pd.DataFrame):
+            used = [column for column in value.columns if column in names]
+            if used:
+                value = value[used]
+        fingerprint = data_fingerprint(value)
+        if fingerprint is None:
+            return None
+        parts.append((name, fingerprint))
+    return (f'{func.__module__}.{func.__qualname__}', tuple(parts))
+
+def _cache_get(key):
+    """
+    Look up a cached figure, marking it as recently used and counting the hit or miss
+    """
+    with _FIGURE_CACHE_LOCK:
+        if key in _FIGURE_CACHE:
+            _FIGURE_CACHE.move_to_end(key)
+            _FIGURE_CACHE_STATS['hits'] += 1
+            return _FIGURE_CACHE[key]
+        _FIGURE_CACHE_STATS['misses'] += 1
+        return None
+
+def _cache_put(key, payload):
+    """
+    Store a cached figure and evict the least recently used ones over the byte budget
+    """
+    if len(payload) > FIGURE_CACHE_MAX_BYTES:
+        return
+    with _FIGURE_CACHE_LOCK:
+        _FIGURE_CACHE[key] = payload
+        _FIGURE_CACHE.move_to_end(key)
+        
+        total = sum(len(value) for value in _FIGURE_CACHE.values())
+        while total > FIGURE_CACHE_MAX_BYTES:
+            _, evicted = _FIGURE_CACHE.popitem(last=False)
+            total -= len(evicted)
+            _FIGURE_CACHE_STATS['evictions'] += 1
+
+def figure_cache_info():
+    """
+    Counters and current size of the figure cache
+    
+    Returns:
+    --------
+    dict
+        hits, misses, evictions, entries, bytes and max_bytes
+    """
+    with _FIGURE_CACHE_LOCK:
+        return {
+            **_FIGURE_CACHE_STATS,
+            'entries': len(_FIGURE_CACHE),
+            'bytes': sum(len(value) for value in _FIGURE_CACHE.values()),
+            'max_bytes': FIGURE_CACHE_MAX_BYTES
+        }
+
+def clear_figure_cache(reset_stats=True):
+    """
+    Forget all cached figures, and reset the counters unless reset_stats=False
+    """
+    with _FIGURE_CACHE_LOCK:
+        _FIGURE_CACHE.clear()
+        if reset_stats:
+            for name in _FIGURE_CACHE_STATS:
+                _FIGURE_CACHE_STATS[name] = 0
+
+def _in_notebook():
+    """
+    Whether we run inside IPython (Jupyter, Colab), where images can be shown inline
+    """
+    import sys
+    
+    ipython = sys.modules.get('IPython')
+    return ipython is not None and ipython.get_ipython() is not None
+
+def _display_image(payload, fmt):
+    """
+    Show rendered figure bytes inline in a notebook
+    """
+    from IPython.display import SVG, Image, display
+    
+    display(SVG(data=payload) if fmt == 'svg' else Image(data=payload))
+
+def _show_figure():
+    """
+    Show the current figure, or leave it open while a cached plot is being rendered
+    """
+    import matplotlib.pyplot as plt
+    
+    if not getattr(_CAPTURE_FIGURES, 'active', False):
+        plt.show()
+
+def cached_figure(func):
+    """
+    Decorator serving repeated matplotlib plots from the figure cache
+    
+    Calls are keyed on (function, fingerprint of the plotted columns,
+    parameters), see `_figure_key`; on a hit the stored image is shown
+    without drawing anything. Caching is opt-in, since hashing the data
+    costs time on every call. The decorated function accepts three extra
+    keyword arguments:
+    
+    cache : bool, default=False
+        Whether to use the cache
+    cache_key : hashable, optional
+        Identifies the data instead of hashing it (e.g. a data version);
+        implies cache=True
+    fmt : str, optional
+        'png' or 'svg' (default FIGURE_FORMAT)
+    
+    In a notebook the image is shown inline and None is returned. Elsewhere
+    (e.g. in Streamlit) the cached call returns the rendered image bytes,
+    e.g. for st.image. Cache misses are drawn one at a time (see
+    _FIGURE_RENDER_LOCK), and the figure saved is the one the call created.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, cache=False, cache_key=None, fmt=None, **kwargs):
+        cache = cache or cache_key is not None
+        fmt = fmt or FIGURE_FORMAT
+        key = _figure_key(func, args, kwargs, cache_key) if cache else None
+        if key is None:
+            return func(*args, **kwargs)
+        key += (fmt,)
+        notebook = _in_notebook()
+        
+        payload = _cache_get(key)
+        if payload is None:
+            import io
+            import matplotlib.pyplot as plt
+            
+            with _FIGURE_RENDER_LOCK:
+                # Save the figure this call created, not whatever is current
+                existing = set(plt.get_fignums())
+                _CAPTURE_FIGURES.active = True
+                try:
+                    func(*args, **kwargs)
+                finally:
+                    _CAPTURE_FIGURES.active = False
+                created = [number for number in plt.get_fignums() if number not in existing]
+                figure = plt.figure(created[-1]) if created else plt.gcf()
+                
+                buffer = io.BytesIO()
+                figure.savefig(buffer, format=fmt, bbox_inches='tight')
+            payload = buffer.getvalue()
+            _cache_put(key, payload)
+            
+            if not notebook:
+                # Scripts still get the usual figure window on a miss
+                plt.show()
+                return payload
+            plt.close(figure)
+        
+        if notebook:
+            _display_image(payload, fmt)
+            return None
+        return payload
+    
+    return wrapper
+
+def cached_plotly_figure(build, *args, cache_key=None, **kwargs):
+    """
+    Build a Plotly figure, or restore it from the figure cache for a repeated call
+    
+    Meant for Streamlit apps, which otherwise rebuild the same charts on every
+    rerun, e.g. `cached_plotly_figure(px.histogram, data, x='review_score')`.
+    The figure is stored as `fig.to_json()` in the same LRU cache (and
+    counters) as the matplotlib figures.
+    
+    Parameters:
+    -----------
+    build : callable
+        Function returning a plotly Figure (e.g. plotly.express.histogram)
+    *args, **kwargs
+        Passed to `build`; DataFrames are fingerprinted by the content of
+        the columns the call names (see `_figure_key`)
+    cache_key : hashable, optional
+        Identifies the data instead of hashing it, e.g. the filter settings
+        the data was selected with; cheaper for large frames
+    
+    Returns:
+    --------
+    plotly.graph_objects.Figure
+        A new figure object on every call, so callers may update it
+    """
+    import plotly.io as pio
+    
+    key = _figure_key(build, args, kwargs, cache_key)
+    if key is None:
+        return build(*args, **kwargs)
+    key += ('plotly',)
+    
+    payload = _cache_get(key)
+    if payload is None:
+        figure = build(*args, **kwargs)
+        _cache_put(key, figure.to_json().encode())
+        return figure
+    return pio.from_json(payload.decode())
+
+def _summary_stats(values, chunk_size=CHUNK_SIZE):
+    """
+    Count, mean, standard deviation, min and max in a single pass over chunks
+    
+    NaN and infinite values are ignored. Each chunk is summarised separately
+    and the chunk results are combined (Chan et al.), which avoids the loss of
+    precision of a plain sum of squares.
+    """
+    import numpy as np
+    
+    count, mean, m2 = 0, 0.0, 0.0
+    minimum, maximum = np.inf, -np.inf
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        chunk = chunk[np.isfinite(chunk)]
+        if len(chunk) == 0:
+            continue
+        
+        chunk_mean = chunk.mean()
+        chunk_m2 = ((chunk - chunk_mean) ** 2).sum()
+        delta = chunk_mean - mean
+        total = count + len(chunk)
+        mean += delta * len(chunk) / total
+        m2 += chunk_m2 + delta ** 2 * count * len(chunk) / total
+        count = total
+        minimum = min(minimum, chunk.min())
+        maximum = max(maximum, chunk.max())
+    
+    return {
+        'count': count,
+        'mean': mean if count else np.nan,
+        'std': np.sqrt(m2 / (count - 1)) if count > 1 else np.nan,
+        'min': minimum if count else np.nan,
+        'max': maximum if count else np.nan
+    }
+
+def _binned_histogram(values, low, high, n_bins, chunk_size=CHUNK_SIZE):
+    """
+    Histogram counts over a fixed range, computed chunk by chunk with bincount
+    """
+    import numpy as np
+    
+    counts = np.zeros(n_bins, dtype='int64')
+    width = (high - low) / n_bins if high > low else 1.0
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        chunk = chunk[np.isfinite(chunk)]
+        index = ((chunk - low) / width).astype('int64')
+        np.clip(index, 0, n_bins - 1, out=index)  # the maximum goes in the last bin
+        counts += np.bincount(index, minlength=n_bins)
+    return counts
+
+def _binned_median(fine_counts, edges):
+    """
+    Approximate median from histogram counts, interpolating inside the median bin
+    """
+    import numpy as np
+    
+    cumulative = np.cumsum(fine_counts)
+    half = cumulative[-1] / 2
+    i = int(np.searchsorted(cumulative, half))
+    before = cumulative[i - 1] if i > 0 else 0
+    fraction = (half - before) / fine_counts[i] if fine_counts[i] else 0.5
+    return edges[i] + fraction * (edges[i + 1] - edges[i])
+
+def _binned_kde(fine_counts, edges, std):
+    """
+    Approximate Gaussian KDE by convolving fine histogram counts with an FFT
+    
+    Uses Scott's rule for the bandwidth, as seaborn does. Returns the grid
+    (fine bin centres) and the density on that grid.
+    """
+    import numpy as np
+    
+    n = fine_counts.sum()
+    width = edges[1] - edges[0]
+    centres = (edges[:-1] + edges[1:]) / 2
+    bandwidth = std * n ** (-1 / 5)
+    if not n or not bandwidth > 0 or not width > 0:
+        return centres, np.zeros(len(centres))
+    
+    # Gaussian kernel sampled on the same grid, out to 4 bandwidths
+    half_width = min(int(np.ceil(4 * bandwidth / width)), len(fine_counts))
+    offsets = np.arange(-half_width, half_width + 1) * width
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    
+    size = len(fine_counts) + len(kernel) - 1
+    smoothed = np.fft.irfft(np.fft.rfft(fine_counts, size) * np.fft.rfft(kernel, size), size)
+    smoothed = smoothed[half_width:half_width + len(fine_counts)]
+    return centres, np.clip(smoothed, 0, None) / (n * width)
+
+@cached_figure
+def plot_numeric_distribution(df, column, bins=30, kde=True, large_n_threshold=LARGE_N_THRESHOLD):
     """
     Plot the distribution of a numeric column
     
+    For columns with more than `large_n_threshold` values, a binned mode is
+    used: the histogram is counted with numpy in chunks, the KDE is
+    approximated by smoothing a fine histogram with an FFT, and the summary
+    statistics come from a single pass (the median is approximate). This
+    takes seconds instead of minutes on tens of millions of rows.
+    
     Parameters:
     -----------
     df : pandas.DataFrame
@@ -39,11 +492,43 @@ def plot_numeric_distribution(df, column, bins=30, kde=True):
         Number of bins in the histogram
     kde : bool, default=True
         Whether to plot the kernel density estimate
+    large_n_threshold : int or None, default=LARGE_N_THRESHOLD
+        Row count above which the binned mode is used (None: never)
     """
     plt, sns = set_plotting_style()
     
-    plt.figure(figsize=(12, 6))
-    ax = sns.histplot(df[column].dropna(), bins=bins, kde=kde)
+    if large_n_threshold is not None and len(df) > large_n_threshold:
+        import numpy as np
+        
+        values = df[column].to_numpy(dtype='float64', na_value=np.nan)
+        stats = _summary_stats(values)
+        
+        # Fine histogram over the data range; display bins are sums of fine bins
+        n_fine = bins * FINE_BINS_PER_BIN
+        fine_counts = _binned_histogram(values, stats['min'], stats['max'], n_fine)
+        fine_edges = np.linspace(stats['min'], stats['max'], n_fine + 1)
+        counts = fine_counts.reshape(bins, FINE_BINS_PER_BIN).sum(axis=1)
+        edges = fine_edges[::FINE_BINS_PER_BIN]
+        stats['median'] = _binned_median(fine_counts, fine_edges)
+        
+        plt.figure(figsize=(12, 6))
+        ax = plt.gca()
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+               color=sns.color_palette()[0], edgecolor='white', alpha=0.75)
+        
+        if kde:
+            grid, density = _binned_kde(fine_counts, fine_edges, stats['std'])
+            # Scale the density to the histogram counts
+            ax.plot(grid, density * stats['count'] * (edges[1] - edges[0]),
+                    color=sns.color_palette()[0])
+        
+        median_label = 'Median (approx.)'
+    else:
+        plt.figure(figsize=(12, 6))
+        ax = sns.histplot(df[column].dropna(), bins=bins, kde=kde)
+        
+        stats = df[column].agg(['mean', 'median', 'std', 'min', 'max'])
+        median_label = 'Median'
     
     # Add title and labels
     plt.title(f'Distribution of {column}', fontsize=16)
@@ -52,75 +537,281 @@ def plot_numeric_distribution(df, column, bins=30, kde=True):
     
     # Add summary statistics as text
     stats_text = (
-        f"Mean: {df[column].mean():.2f}\n"
-        f"Median: {df[column].median():.2f}\n"
-        f"Std Dev: {df[column].std():.2f}\n"
-        f"Min: {df[column].min():.2f}\n"
-        f"Max: {df[column].max():.2f}"
+        f"Mean: {stats['mean']:.2f}\n"
+        f"{median_label}: {stats['median']:.2f}\n"
+        f"Std Dev: {stats['std']:.2f}\n"
+        f"Min: {stats['min']:.2f}\n"
+        f"Max: {stats['max']:.2f}"
     )
     plt.annotate(stats_text, xy=(0.95, 0.95), xycoords='axes fraction',
                  bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8),
                  ha='right', va='top', fontsize=12)
     
     plt.tight_layout()
-    plt.show()
+    _show_figure()
+
+def _top_n_counts(values, top_n=None):
+    """
+    Count the values of a Series and return the top N, largest first
+    
+    The values are factorised once (category columns reuse their codes),
+    counted with np.bincount, and only the top N are selected with
+    np.argpartition, instead of sorting every distinct value. Returns the
+    counts and the total number of distinct values.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    present = np.flatnonzero(counts)  # unused categories do not count
+    
+    if top_n is not None and top_n < len(present):
+        present = present[np.argpartition(-counts[present], top_n - 1)[:top_n]]
+    
+    # Largest first; ties keep the order in which values first appear
+    present = present[np.argsort(-counts[present], kind='stable')]
+    return pd.Series(counts[present], index=uniques[present], name='count'), int((counts > 0).sum())
+
+def heavy_hitters(chunks, capacity=1000):
+    """
+    Approximate value counts of a very large or streamed column
+    
+    Uses the Misra-Gries summary (the counter-based method that Space-Saving
+    refines): at most `capacity` values are tracked, so memory stays bounded
+    however many distinct values there are. Each chunk is counted exactly
+    and merged into the summary in one vectorised step. Any value that occurs
+    more than total / (capacity + 1) times is guaranteed to be kept, and
+    each returned count is at most total / (capacity + 1) below the true count.
+    
+    Parameters:
+    -----------
+    chunks : iterable of pandas.Series or array-like
+        The column, one chunk at a time (e.g. from olist_helper.iter_olist_data)
+    capacity : int, default=1000
+        Maximum number of values tracked
+    
+    Returns:
+    --------
+    tuple of (pandas.Series, int)
+        Approximate counts (largest first) and the total number of values seen
+    """
+    import pandas as pd
+    
+    summary = pd.Series(dtype='int64')
+    total = 0
+    for chunk in chunks:
+        chunk_counts = pd.Series(chunk).value_counts()
+        total += int(chunk_counts.sum())
+        summary = summary.add(chunk_counts, fill_value=0)
+        
+        if len(summary) > capacity:
+            # Subtract the (capacity + 1)-th largest count and drop what falls to zero
+            threshold = summary.nlargest(capacity + 1).iloc[-1]
+            summary = summary[summary > threshold] - threshold
+    
+    summary = summary.astype('int64').sort_values(ascending=False, kind='stable')
+    summary.name = 'count'
+    return summary, total
 
-def plot_categorical_distribution(df, column, top_n=None, sort_by_value=True):
+@cached_figure
+def plot_categorical_distribution(df, column, top_n=None, sort_by_value=True, approximate=False,
+                                  capacity=1000):
     """
     Plot the distribution of a categorical column
     
     Parameters:
     -----------
-    df : pandas.DataFrame
-        DataFrame containing the data
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        DataFrame containing the data, or DataFrame chunks (e.g. from
+        olist_helper.iter_olist_data), which are counted with `heavy_hitters`
     column : str
         Name of the column to plot
     top_n : int, optional
         If provided, show only the top N categories
     sort_by_value : bool, default=True
         Whether to sort bars by frequency (True) or by category name (False)
+    approximate : bool, default=False
+        Count with `heavy_hitters` instead of exactly, for columns with a huge
+        number of distinct values (e.g. product_id); always used for chunks
+    capacity : int, default=1000
+        Number of values tracked when counting approximately
     """
+    import pandas as pd
     plt, sns = set_plotting_style()
     
-    # Count values and convert to DataFrame for easier manipulation
-    value_counts = df[column].value_counts()
-    
-    if top_n is not None and top_n < len(value_counts):
-        if sort_by_value:
-            # Get the top N most frequent categories
-            data = value_counts.head(top_n)
-        else:
-            # Get the top N most frequent categories, then sort alphabetically
-            data = value_counts.head(top_n).sort_index()
+    # Count values, keeping only the categories that will be shown
+    if isinstance(df, pd.DataFrame) and not approximate:
+        data, n_categories = _top_n_counts(df[column], top_n)
     else:
-        if sort_by_value:
-            data = value_counts
+        if isinstance(df, pd.DataFrame):
+            chunks = (df[column].iloc[start:start + CHUNK_SIZE]
+                      for start in range(0, len(df), CHUNK_SIZE))
         else:
-            data = value_counts.sort_index()
+            chunks = (chunk[column] for chunk in df)
+        data, _ = heavy_hitters(chunks, capacity=max(capacity, top_n or 0))
+        n_categories = len(data)
+        if top_n is not None:
+            data = data.head(top_n)
+        if n_categories >= capacity:
+            # Tracked values are a subset of all values, so the true count is unknown
+            n_categories = float('inf')
+    
+    if not sort_by_value:
+        # Sort the (top N) categories alphabetically
+        data = data.sort_index()
     
     plt.figure(figsize=(12, 8))
     
     # Create the bar plot
-    ax = sns.barplot(x=data.index, y=data.values)
+    ax = sns.barplot(x=data.index.astype(str), y=data.values)
     
     # Add title and labels
     plt.title(f'Distribution of {column}' + 
-              (f' (Top {top_n})' if top_n is not None and top_n < len(value_counts) else ''), 
+              (f' (Top {top_n})' if top_n is not None and top_n < n_categories else ''), 
               fontsize=16)
     plt.xlabel(column, fontsize=12)
     plt.ylabel('Count', fontsize=12)
     
     # Rotate x-axis labels if there are many categories
-    if len(data) > 10 or data.index.str.len().max() > 10:
+    if len(data) > 10 or data.index.astype(str).str.len().max() > 10:
         plt.xticks(rotation=45, ha='right')
     
     # Add count on top of each bar
-    for i, v in enumerate(data.values):
-        ax.text(i, v + 0.1, str(v), ha='center')
+    ax.bar_label(ax.containers[0], fmt='%d')
     
     plt.tight_layout()
-    plt.show()
+    _show_figure()
+
+def _normalize_freq(freq):
+    """
+    Translate 'M', 'Q' and 'Y' to the period-end aliases newer pandas requires
+    """
+    from pandas.tseries.frequencies import to_offset
+    
+    try:
+        to_offset(freq)
+        return freq
+    except ValueError:
+        return {'M': 'ME', 'Q': 'QE', 'Y': 'YE', 'A': 'YE'}.get(freq, freq)
 
+def build_daily_rollup(df, date_column, value_column):
+    """
+    Reduce a column to one row of partial aggregates per day
+    
+    The partials (see ROLLUP_PARTIALS) can be merged into any coarser
+    period, so weekly, monthly or quarterly views are computed from a few
+    hundred daily rows instead of from the raw data.
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame containing the data
+    date_column : str
+        Name of the date column
+    value_column : str
+        Name of the value column
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per day (DatetimeIndex) with one column per ROLLUP_PARTIALS entry
+    """
+    return _partial_aggregates(df, date_column, value_column, 'D')
+
+def _partial_aggregates(df, date_column, value_column, freq):
+    """
+    ROLLUP_PARTIALS of a column for each period of the given frequency
+    """
+    import pandas as pd
+    
+    dates = df[date_column]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    
+    values = pd.Series(df[value_column].to_numpy(), index=pd.DatetimeIndex(dates))
+    values = values[values.index.notna()]
+    
+    built = pd.DataFrame({name: build(values) for name, (build, _) in ROLLUP_PARTIALS.items()})
+    return built.resample(freq).agg({name: merge for name, (_, merge) in ROLLUP_PARTIALS.items()})
+
+def rollup_resample(daily, freq, agg_func='mean'):
+    """
+    Compute a resampled aggregate from daily partials
+    
+    Parameters:
+    -----------
+    daily : pandas.DataFrame
+        Result of `build_daily_rollup`
+    freq : str
+        Frequency to resample to (daily or coarser, e.g. 'D', 'W', 'M', 'Q')
+    agg_func : str, default='mean'
+        Any key of ROLLUP_AGGREGATES
+    
+    Returns:
+    --------
+    pandas.Series
+        One value per period
+    """
+    if agg_func not in ROLLUP_AGGREGATES:
+        raise ValueError(f"Unsupported aggregation function: {agg_func}")
+    
+    merged = daily.resample(_normalize_freq(freq)).agg(
+        {name: merge for name, (_, merge) in ROLLUP_PARTIALS.items()}
+    )
+    return ROLLUP_AGGREGATES[agg_func](merged)
+
+def _frame_signature(df, columns):
+    """
+    Hash of every value of the given columns (plus their dtypes), so a frame
+    edited in place gets a new signature. Hashing a date and a value column
+    is cheap next to rolling them up.
+    """
+    import hashlib
+    import pandas as pd
+    
+    subset = df[columns]
+    row_hashes = pd.util.hash_pandas_object(subset, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(repr([str(dtype) for dtype in subset.dtypes]).encode())
+    return digest.hexdigest()
+
+def _cached_daily_rollup(df, date_column, value_column):
+    """
+    Return the daily rollup of a DataFrame column, building it only once
+    
+    The cache is keyed on the content of the date and value columns, so any
+    change to them (including edits in place) builds the rollup again, and
+    equal data in another frame reuses it.
+    """
+    key = (_frame_signature(df, [date_column, value_column]), date_column, value_column)
+    
+    with _ROLLUP_CACHE_LOCK:
+        if key in _ROLLUP_CACHE:
+            _ROLLUP_CACHE.move_to_end(key)
+            return _ROLLUP_CACHE[key]
+    
+    daily = build_daily_rollup(df, date_column, value_column)
+    
+    with _ROLLUP_CACHE_LOCK:
+        _ROLLUP_CACHE[key] = daily
+        while len(_ROLLUP_CACHE) > ROLLUP_CACHE_MAX_ENTRIES:
+            _ROLLUP_CACHE.popitem(last=False)
+    
+    return daily
+
+def clear_rollup_cache():
+    """
+    Forget all cached daily rollups used by plot_time_series
+    """
+    with _ROLLUP_CACHE_LOCK:
+        _ROLLUP_CACHE.clear()
+
+@cached_figure
 def plot_time_series(df, date_column, value_column, freq='M', agg_func='mean'):
     """
     Plot a time series with resampling
@@ -136,27 +827,28 @@ def plot_time_series(df, date_column, value_column, freq='M', agg_func='mean'):
     freq : str, default='M'
         Frequency for resampling ('D' for daily, 'W' for weekly, 'M' for monthly, etc.)
     agg_func : str, default='mean'
-        Aggregation function for resampling ('mean', 'sum', 'count', etc.)
+        Aggregation function for resampling (any key of ROLLUP_AGGREGATES:
+        'mean', 'sum', 'count', 'min', 'max', 'std', 'var')
+    
+    The first call for a DataFrame column builds daily partial aggregates
+    (see `build_daily_rollup`); later calls with any daily or coarser
+    frequency are computed from those partials without touching the raw rows.
     """
     import pandas as pd
+    from pandas.tseries.frequencies import to_offset
     plt, sns = set_plotting_style()
     
-    # Make sure the date column is in datetime format
-    df = df.copy()
-    df[date_column] = pd.to_datetime(df[date_column])
-    
-    # Set the date as index for resampling
-    df_ts = df.set_index(date_column)[[value_column]]
+    if agg_func not in ROLLUP_AGGREGATES:
+        raise ValueError(f"Unsupported aggregation function: {agg_func}")
     
-    # Resample the data
-    if agg_func == 'mean':
-        resampled = df_ts.resample(freq).mean()
-    elif agg_func == 'sum':
-        resampled = df_ts.resample(freq).sum()
-    elif agg_func == 'count':
-        resampled = df_ts.resample(freq).count()
+    if isinstance(to_offset(_normalize_freq(freq)), pd.offsets.Tick):
+        # Finer than a day (e.g. hourly): resample the raw rows
+        partials = _partial_aggregates(df, date_column, value_column, freq)
+        resampled = ROLLUP_AGGREGATES[agg_func](partials)
     else:
-        raise ValueError(f"Unsupported aggregation function: {agg_func}")
+        daily = _cached_daily_rollup(df, date_column, value_column)
+        resampled = rollup_resample(daily, freq, agg_func)
+    resampled = resampled.rename(value_column).to_frame()
     
     plt.figure(figsize=(14, 7))
     
@@ -179,4 +871,4 @@ def plot_time_series(df, date_column, value_column, freq='M', agg_func='mean'):
     
     plt.tight_layout()
     plt.grid(True, alpha=0.3)
-    plt.show()
\ No newline at end of file
+    _show_figure()
\ No newline at end of file
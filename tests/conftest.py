@@ -0,0 +1,43 @@
+# Shared test setup: make the Utilities package importable from the repo root
+# and provide a small Olist dataset in a temporary Data folder.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Number of orders in the test dataset; chosen so common chunk sizes do not divide it
+TEST_ORDERS = 2003
+
+@pytest.fixture(scope='session')
+def olist_csv_dir(tmp_path_factory):
+    """
+    Synthetic Olist CSV files, generated once per test session
+    """
+    from Utilities import olist_helper
+    from Utilities.synthetic_data_helper import generate_olist_table
+    
+    csv_dir = tmp_path_factory.mktemp('olist_csv')
+    for table_name in ['orders', 'order_payments', 'order_items', 'customers', 'products']:
+        df = generate_olist_table(table_name, TEST_ORDERS, seed=7)
+        df.to_csv(csv_dir / olist_helper.TABLE_MAP[table_name], index=False)
+    return csv_dir
+
+@pytest.fixture
+def olist_data_dir(olist_csv_dir, tmp_path, monkeypatch):
+    """
+    Copy the synthetic CSV files to a fresh Data folder (so every test starts
+    without a Parquet cache) and point olist_helper at it
+    """
+    import shutil
+    from Utilities import olist_helper
+    
+    data_dir = tmp_path / 'Data'
+    shutil.copytree(olist_csv_dir, data_dir)
+    
+    monkeypatch.setattr(olist_helper, 'DATA_DIR', str(data_dir))
+    monkeypatch.setattr(olist_helper, 'CACHE_DIR', str(data_dir / '.cache'))
+    olist_helper._JOIN_INDEX.clear()
+    return data_dir
@@ -0,0 +1,73 @@
+# Tests for the local mirror behind load_github_data, against a local HTTP
+# server standing in for GitHub.
+
+import functools
+import http.server
+import threading
+
+import pandas as pd
+import pytest
+
+from Utilities import colab_helper
+from Utilities.colab_helper import load_github_data
+
+pytest.importorskip('requests')
+
+CSV_TEXT = "customer_id,amount\nC1,10.5\nC2,20.0\n"
+
+class _RecordingHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Static file handler that records the status code of every response
+    """
+    
+    def log_request(self, code='-', size='-'):
+        self.server.statuses.append(int(code))
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """
+    Serve a folder with one CSV file and point the mirror at a fresh folder
+    """
+    served = tmp_path / 'served'
+    (served / 'data').mkdir(parents=True)
+    (served / 'data' / 'customers.csv').write_text(CSV_TEXT)
+    monkeypatch.setattr(colab_helper, 'GITHUB_CACHE_DIR', str(tmp_path / 'mirror'))
+    monkeypatch.setattr(colab_helper, 'OFFLINE', False)
+    
+    handler = functools.partial(_RecordingHandler, directory=str(served))
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    httpd.statuses = []
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                              daemon=True)
+    thread.start()
+    httpd.base_url = f'http://127.0.0.1:{httpd.server_address[1]}/'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_first_fetch_fills_the_mirror(server):
+    df = load_github_data('data/customers.csv', base_url=server.base_url)
+    
+    assert server.statuses == [200]
+    assert df['customer_id'].tolist() == ['C1', 'C2']
+    entry = colab_helper._read_cache_index()[server.base_url + 'data/customers.csv']
+    assert colab_helper._read_cache_entry(entry) == CSV_TEXT.encode()
+
+def test_unchanged_file_is_not_downloaded_again(server):
+    first = load_github_data('data/customers.csv', base_url=server.base_url)
+    second = load_github_data('data/customers.csv', base_url=server.base_url)
+    
+    assert server.statuses == [200, 304]
+    pd.testing.assert_frame_equal(second, first)
+
+def test_offline_mode_uses_the_mirror(server):
+    first = load_github_data('data/customers.csv', base_url=server.base_url)
+    offline = load_github_data('data/customers.csv', base_url=server.base_url, offline=True)
+    
+    assert server.statuses == [200]
+    pd.testing.assert_frame_equal(offline, first)
+
+def test_offline_mode_without_mirror_raises(server):
+    with pytest.raises(FileNotFoundError):
+        load_github_data('data/customers.csv', base_url=server.base_url, offline=True)
+    assert server.statuses == []
@@ -0,0 +1,41 @@
+# Tests for the figure cache in visualization_helper: cached plots drawn from
+# several threads at once must each save their own figure.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('matplotlib')
+pytest.importorskip('seaborn')
+
+from Utilities import visualization_helper
+from Utilities.visualization_helper import clear_figure_cache, plot_numeric_distribution
+
+@pytest.fixture
+def frames(monkeypatch):
+    import matplotlib
+    matplotlib.use('Agg')
+    monkeypatch.setattr(visualization_helper, '_in_notebook', lambda: False)
+    clear_figure_cache()
+    yield [pd.DataFrame({'value': np.random.default_rng(seed).gamma(seed + 1, 10, 2000)})
+           for seed in range(4)]
+    clear_figure_cache()
+
+def test_concurrent_misses_save_their_own_figure(frames):
+    import matplotlib.pyplot as plt
+    
+    expected = [plot_numeric_distribution(df, 'value', cache_key=('serial', i))
+                for i, df in enumerate(frames)]
+    plt.close('all')
+    
+    def draw(i):
+        return plot_numeric_distribution(frames[i % len(frames)], 'value', cache_key=('threaded', i))
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        payloads = list(pool.map(draw, range(8)))
+    plt.close('all')
+    
+    for i, payload in enumerate(payloads):
+        assert payload == expected[i % len(frames)]
@@ -0,0 +1,59 @@
+# Import-time regression tests: `import Utilities` must stay fast and must not
+# load the heavy libraries (the helper modules are imported lazily).
+
+import json
+import os
+import subprocess
+import sys
+
+# Maximum time (in milliseconds) `import Utilities` may take
+IMPORT_TIME_BUDGET_MS = 50
+
+# Libraries a bare `import Utilities` must not load
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib', 'seaborn', 'plotly', 'streamlit']
+
+# Folder containing the Utilities package
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run(code, *args):
+    """
+    Run Python code in a fresh interpreter from the repository root
+    """
+    return subprocess.run([sys.executable, *args, '-c', code], capture_output=True, text=True,
+                          cwd=PACKAGE_ROOT, check=True)
+
+def _import_time_ms():
+    """
+    Cumulative import time of the Utilities package, from `python -X importtime`
+    """
+    result = _run('import Utilities', '-X', 'importtime')
+    
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == 'Utilities':
+            return int(cumulative) / 1000
+    raise AssertionError("Utilities not found in the -X importtime output")
+
+def test_import_stays_under_budget():
+    # Best of a few runs, so a busy machine does not fail the test
+    elapsed = min(_import_time_ms() for _ in range(3))
+    assert elapsed < IMPORT_TIME_BUDGET_MS, \
+        f"import Utilities took {elapsed:.1f} ms (budget {IMPORT_TIME_BUDGET_MS} ms)"
+
+def test_import_does_not_load_heavy_modules():
+    code = ('import json, sys\n'
+            'import Utilities\n'
+            f'print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))')
+    loaded = json.loads(_run(code).stdout)
+    assert loaded == [], f"import Utilities loads {loaded}; import them inside functions instead"
+
+def test_helpers_are_imported_on_first_use():
+    code = ('import json, sys\n'
+            'import Utilities\n'
+            'Utilities.olist_helper\n'
+            'print(json.dumps(["Utilities.olist_helper" in sys.modules, '
+            '"Utilities.visualization_helper" in sys.modules]))')
+    assert json.loads(_run(code).stdout) == [True, False]
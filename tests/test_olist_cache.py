@@ -0,0 +1,28 @@
+# Tests for the Parquet cache behind load_olist_data: a damaged cache file
+# must be replaced by a fresh one instead of breaking the load.
+
+import os
+
+import pandas as pd
+import pytest
+
+from Utilities import olist_helper
+from Utilities.olist_helper import load_olist_data
+
+@pytest.mark.parametrize('content', [b'', b'not a parquet file', b'PAR1' + b'\0' * 64],
+                         ids=['empty', 'garbage', 'truncated'])
+def test_damaged_cache_is_rebuilt(olist_data_dir, content):
+    pytest.importorskip('pyarrow')
+    
+    expected = load_olist_data('orders', use_cache=False)
+    cache_path = olist_helper._cache_path(olist_helper._table_path('orders'))
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        f.write(content)
+    
+    loaded = load_olist_data('orders')
+    pd.testing.assert_frame_equal(loaded, expected, check_dtype=False, check_categorical=False)
+    
+    # The rebuilt cache is readable again
+    pd.testing.assert_frame_equal(pd.read_parquet(cache_path), loaded, check_dtype=False,
+                                  check_categorical=False)
@@ -0,0 +1,81 @@
+# Tests for join_olist_tables: filters pushed into the table loads must give
+# the same rows as joining everything and filtering afterwards.
+
+import pandas as pd
+import pytest
+
+from Utilities.olist_helper import join_olist_tables
+
+def _canonical(df):
+    """
+    Sort rows and columns so two joins can be compared regardless of order
+    """
+    df = df[sorted(df.columns)]
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+    return df.sort_values(list(df.columns), na_position='last', ignore_index=True)
+
+# (tables, filters, grain); every filtered column is kept in the result so
+# the same filter can be applied after the join
+CASES = [
+    (['orders', 'customers'],
+     {'customers': [('customer_state', '==', 'SP')]}, 'item'),
+    (['orders', 'customers', 'order_payments'],
+     {'customers': [('customer_state', '==', 'SP')]}, 'order'),
+    (['orders', 'customers', 'order_payments'],
+     {'customers': [('customer_state', 'in', ['SP', 'RJ'])],
+      'orders': [('order_status', '==', 'delivered')]}, 'item'),
+    (['orders', 'order_items'],
+     {'order_items': [('price', '>', 100)]}, 'item'),
+    (['orders', 'customers', 'products'],
+     {'products': [('product_weight_g', '<', 1000)]}, 'item')
+]
+
+def _filter_after_join(joined, filters):
+    mask = pd.Series(True, index=joined.index)
+    ops = {
+        '==': lambda values, value: values == value,
+        '>': lambda values, value: values > value,
+        '<': lambda values, value: values < value,
+        'in': lambda values, value: values.isin(value)
+    }
+    for table_filters in filters.values():
+        for column, op, value in table_filters:
+            mask &= ops[op](joined[column], value).fillna(False).astype(bool)
+    return joined[mask]
+
+@pytest.mark.parametrize('tables, filters, grain', CASES)
+def test_filters_match_filtering_after_join(olist_data_dir, tables, filters, grain):
+    expected = _filter_after_join(join_olist_tables(tables, grain=grain), filters)
+    pushed = join_olist_tables(tables, filters=filters, grain=grain)
+    
+    assert len(expected) > 0
+    assert len(pushed) == len(expected)
+    pd.testing.assert_frame_equal(_canonical(pushed), _canonical(expected), check_dtype=False)
+
+def test_filtered_lookup_drops_unmatched_orders(olist_data_dir):
+    joined = join_olist_tables(['orders', 'customers'],
+                               filters={'customers': [('customer_state', '==', 'SP')]})
+    
+    assert joined['customer_state'].notna().all()
+    assert (joined['customer_state'] == 'SP').all()
+
+def test_unfiltered_joins_stay_left_joins(olist_data_dir):
+    orders = join_olist_tables(['orders'])
+    joined = join_olist_tables(['orders', 'order_items'], grain='order')
+    
+    assert len(joined) == len(orders)
+
+def test_order_grain_keeps_only_suffixed_aggregates(olist_data_dir):
+    items = join_olist_tables(['orders', 'order_items'])
+    joined = join_olist_tables(['orders', 'order_items'], grain='order')
+    
+    assert joined['order_id'].is_unique
+    assert {'item_count', 'price_sum', 'freight_value_sum'} <= set(joined.columns)
+    assert not {'price', 'freight_value', 'product_id', 'seller_id'} & set(joined.columns)
+    
+    expected = items.groupby('order_id', observed=True)['price'].sum()
+    price_sum = joined.set_index('order_id')['price_sum'].dropna()
+    pd.testing.assert_series_equal(price_sum, expected.loc[price_sum.index], check_names=False,
+                                   check_index=False)
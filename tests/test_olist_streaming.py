@@ -0,0 +1,93 @@
+# Tests for the chunked readers in olist_helper: streamed results must match
+# the same computation on the fully loaded table.
+
+import pandas as pd
+import pytest
+
+from Utilities.olist_helper import (iter_olist_data, load_olist_data, stream_aggregate,
+                                    stream_value_counts)
+
+# 97 and 250 do not divide the row counts (TEST_ORDERS is prime); 10**6 reads
+# everything in one chunk
+CHUNK_SIZES = [97, 250, 10**6]
+
+# Read the CSV in chunks, and the Parquet cache batch by batch
+SOURCES = [False, True]
+
+@pytest.fixture(params=SOURCES, ids=['csv', 'parquet'])
+def use_cache(request, olist_data_dir):
+    if request.param:
+        pytest.importorskip('pyarrow')
+        # Build the Parquet cache so the chunked readers use it
+        for table_name in ['orders', 'order_payments', 'customers']:
+            load_olist_data(table_name)
+    return request.param
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_iter_olist_data_matches_full_load(use_cache, chunksize):
+    full = load_olist_data('order_payments', use_cache=use_cache)
+    chunks = list(iter_olist_data('order_payments', chunksize=chunksize, use_cache=use_cache))
+    
+    assert all(len(chunk) <= chunksize for chunk in chunks)
+    streamed = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, full.reset_index(drop=True), check_dtype=False,
+                                  check_categorical=False)
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_stream_aggregate_matches_groupby(use_cache, chunksize):
+    aggregations = {
+        'payment_value': ['count', 'sum', 'mean', 'min', 'max'],
+        'payment_installments': ['sum', 'max']
+    }
+    streamed = stream_aggregate('order_payments', aggregations, by='payment_type',
+                                chunksize=chunksize, use_cache=use_cache)
+    
+    full = load_olist_data('order_payments', use_cache=use_cache)
+    expected = full.groupby('payment_type', observed=True).agg(aggregations)
+    expected.columns = [f'{column}_{func}' for column, func in expected.columns]
+    
+    streamed.index = streamed.index.astype(str)
+    expected.index = expected.index.astype(str)
+    pd.testing.assert_frame_equal(streamed.sort_index(), expected.sort_index(), check_dtype=False,
+                                  check_exact=False, rtol=1e-9)
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_stream_aggregate_without_groups(use_cache, chunksize):
+    streamed = stream_aggregate('order_payments', {'payment_value': ['count', 'sum', 'mean']},
+                                chunksize=chunksize, use_cache=use_cache)
+    
+    values = load_olist_data('order_payments', use_cache=use_cache)['payment_value']
+    assert len(streamed) == 1
+    assert streamed.loc[0, 'payment_value_count'] == values.count()
+    assert streamed.loc[0, 'payment_value_sum'] == pytest.approx(values.sum())
+    assert streamed.loc[0, 'payment_value_mean'] == pytest.approx(values.mean())
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_stream_aggregate_with_filters(use_cache, chunksize):
+    filters = [('order_status', '==', 'delivered')]
+    streamed = stream_aggregate('orders', {'order_id': ['count']}, by='order_status',
+                                chunksize=chunksize, filters=filters, use_cache=use_cache)
+    
+    orders = load_olist_data('orders', use_cache=use_cache)
+    expected = (orders['order_status'] == 'delivered').sum()
+    assert streamed['order_id_count'].tolist() == [expected]
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_stream_aggregate_without_groups_or_matches(use_cache, chunksize):
+    filters = [('payment_type', '==', 'no such type')]
+    streamed = stream_aggregate('order_payments', {'payment_value': ['count', 'sum', 'mean', 'max']},
+                                chunksize=chunksize, filters=filters, use_cache=use_cache)
+    
+    assert len(streamed) == 1
+    assert streamed.loc[0, 'payment_value_count'] == 0
+    assert streamed.loc[0, ['payment_value_sum', 'payment_value_mean', 'payment_value_max']].isna().all()
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_stream_value_counts_matches_value_counts(use_cache, chunksize):
+    streamed = stream_value_counts('customers', 'customer_state', chunksize=chunksize,
+                                   use_cache=use_cache)
+    
+    expected = load_olist_data('customers', use_cache=use_cache)['customer_state'].astype(object).value_counts()
+    pd.testing.assert_series_equal(streamed.sort_index(), expected.sort_index(), check_names=False,
+                                   check_index_type=False)
+    assert streamed.is_monotonic_decreasing